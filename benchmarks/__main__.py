@@ -0,0 +1,48 @@
+import json
+import sys
+from argparse import ArgumentParser
+from typing import List, Optional
+
+from ._runner import compare, environment, run
+from ._workloads import WORKLOADS
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(prog="python3 -m benchmarks",
+                            description="Time revolt.substitute() on generated workloads")
+    parser.add_argument("patterns", nargs="*", metavar="PATTERN",
+                        help="run only workloads matching these glob patterns")
+    parser.add_argument("-o", "--output", help="write JSON results to this file")
+    parser.add_argument("-c", "--compare", metavar="BASELINE",
+                        help="print the ratio to the JSON results of a previous run")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--list", action="store_true", help="list workloads and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(WORKLOADS))
+        return 0
+
+    report = {**environment(), "results": run(args.patterns, repeat=args.repeat)}
+
+    ratios = {}
+    if args.compare:
+        with open(args.compare) as f:
+            ratios = compare(report["results"], json.load(f)["results"])
+
+    for name, stats in report["results"].items():
+        line = f"{name:<16} min {stats['min'] * 1e3:10.3f}ms  cold {stats['cold'] * 1e3:10.3f}ms"
+        if name in ratios:
+            line += f"  x{ratios[name]:.2f}"
+        print(line, file=sys.stderr)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+from typing import Any
+from uuid import UUID
+
+from district42 import Props, SchemaVisitor
+from district42 import SchemaVisitorReturnType as ReturnType
+from district42.types import Schema
+from niltype import Nil, Nilable
+from th import PathHolder
+from valera import ValidationResult, Validator
+
+from revolt import Substitutor
+
+__all__ = ("UUIDSchema",)
+
+
+# the custom type from README, registered the same way
+class UUIDProps(Props):
+    @property
+    def value(self) -> Nilable[UUID]:
+        return self.get("value")
+
+
+class UUIDSchema(Schema[UUIDProps]):
+    def __accept__(self, visitor: SchemaVisitor[ReturnType], **kwargs: Any) -> ReturnType:
+        return visitor.visit_uuid(self, **kwargs)  # type: ignore
+
+    def __call__(self, /, value: UUID) -> "UUIDSchema":
+        return self.__class__(self.props.update(value=value))
+
+
+class UUIDValidator(Validator, extend=True):
+    def visit_uuid(self, schema: UUIDSchema, *,
+                   value: Any = Nil, path: Nilable[PathHolder] = Nil,
+                   **kwargs: Any) -> ValidationResult:
+        result = self._validation_result_factory()
+        if path is Nil:
+            path = self._path_holder_factory()
+        if error := self._validate_type(path, value, UUID):
+            result.add_error(error)
+        return result
+
+
+class UUIDSubstitutor(Substitutor, extend=True):
+    def visit_uuid(self, schema: UUIDSchema, *, value: Any = Nil, **kwargs: Any) -> UUIDSchema:
+        assert isinstance(value, UUID) and schema.props.value is Nil
+
+        return schema.__class__(schema.props.update(value=value))
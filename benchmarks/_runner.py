@@ -0,0 +1,90 @@
+import gc
+import platform
+import sys
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from importlib.metadata import PackageNotFoundError
+from importlib.metadata import version as package_version
+from statistics import mean, median
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+from revolt import substitute
+from revolt._version import version as revolt_version
+
+from ._workloads import WORKLOADS, Workload
+
+__all__ = ("run", "environment", "compare",)
+
+
+def _version(package: str) -> Optional[str]:
+    try:
+        return package_version(package)
+    except PackageNotFoundError:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "packages": {
+            "revolt": revolt_version,  # the benchmarked tree, not necessarily installed
+            **{name: _version(name) for name in ("district42", "valera", "numpy")},
+        },
+    }
+
+
+def _measure(workload: Workload, repeat: int, min_time: float) -> Dict[str, Any]:
+    sch, value = workload()
+
+    gc.collect()
+    started = perf_counter()
+    substitute(sch, value)  # compiles the plan
+    cold = perf_counter() - started
+
+    number = 1
+    while True:
+        started = perf_counter()
+        for _ in range(number):
+            substitute(sch, value)
+        elapsed = perf_counter() - started
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = perf_counter()
+        for _ in range(number):
+            substitute(sch, value)
+        timings.append((perf_counter() - started) / number)
+
+    return {
+        "cold": cold,
+        "min": min(timings),
+        "mean": mean(timings),
+        "median": median(timings),
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run(patterns: List[str], repeat: int = 5, min_time: float = 0.2) -> Dict[str, Any]:
+    results = {}
+    for name, workload in WORKLOADS.items():
+        if patterns and not any(fnmatch(name, pattern) for pattern in patterns):
+            continue
+        results[name] = _measure(workload, repeat, min_time)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> Dict[str, float]:
+    ratios = {}
+    for name, stats in results.items():
+        if name in baseline:
+            ratios[name] = stats["min"] / baseline[name]["min"]
+    return ratios
@@ -0,0 +1,91 @@
+from typing import Any, Callable, Dict, Tuple
+from uuid import UUID
+
+from district42 import GenericSchema, schema
+
+from ._custom_types import UUIDSchema
+
+__all__ = ("WORKLOADS", "Workload",)
+
+# builds a (schema, value) pair, the first substitution of a fresh schema compiles its plan
+Workload = Callable[[], Tuple[GenericSchema, Any]]
+
+WORKLOADS: Dict[str, Workload] = {}
+
+
+def workload(name: str) -> Callable[[Workload], Workload]:
+    def register(fn: Workload) -> Workload:
+        WORKLOADS[name] = fn
+        return fn
+    return register
+
+
+@workload("dict_deep")
+def dict_deep(depth: int = 50) -> Tuple[GenericSchema, Any]:
+    sch: GenericSchema = schema.dict({"id": schema.int, "name": schema.str})
+    value: Any = {"id": depth, "name": "leaf"}
+    for level in range(depth):
+        sch = schema.dict({"id": schema.int, "child": sch})
+        value = {"id": level, "child": value}
+    return sch, value
+
+
+@workload("dict_wide")
+def dict_wide(width: int = 1000) -> Tuple[GenericSchema, Any]:
+    sch = schema.dict({f"key{i}": schema.int for i in range(width)})
+    return sch, {f"key{i}": i for i in range(width)}
+
+
+@workload("dict_relaxed")
+def dict_relaxed(width: int = 1000) -> Tuple[GenericSchema, Any]:
+    return schema.dict({...: ...}), {f"key{i}": i for i in range(width)}
+
+
+@workload("list_untyped")
+def list_untyped(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    return schema.list, list(range(size))
+
+
+@workload("list_typed")
+def list_typed(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    return schema.list(schema.int), list(range(size))
+
+
+@workload("list_of_dicts")
+def list_of_dicts(size: int = 1000) -> Tuple[GenericSchema, Any]:
+    sch = schema.list(schema.dict({"id": schema.int, "name": schema.str, "tags": schema.list}))
+    return sch, [{"id": i, "name": f"user{i}", "tags": ["a", "b"]} for i in range(size)]
+
+
+@workload("list_head")
+def list_head(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    return schema.list([schema.int(0), schema.int(1), ...]), list(range(size))
+
+
+@workload("list_tail")
+def list_tail(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    return schema.list([..., schema.int(size - 1)]), list(range(size))
+
+
+@workload("list_body")
+def list_body(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    middle = size // 2
+    return schema.list([..., schema.int(middle), schema.int(middle + 1), ...]), list(range(size))
+
+
+@workload("list_body_dicts")
+def list_body_dicts(size: int = 1000) -> Tuple[GenericSchema, Any]:
+    sch = schema.list([..., schema.dict({"id": schema.int(size - 1), "name": schema.str}), ...])
+    return sch, [{"id": i, "name": f"user{i}"} for i in range(size)]
+
+
+@workload("any_union")
+def any_union(size: int = 10_000) -> Tuple[GenericSchema, Any]:
+    sch = schema.list(schema.any(schema.none, schema.bool, schema.int, schema.float, schema.str))
+    samples = [None, True, 1, 1.5, "a"]
+    return sch, [samples[i % len(samples)] for i in range(size)]
+
+
+@workload("custom_type")
+def custom_type(size: int = 1000) -> Tuple[GenericSchema, Any]:
+    return schema.list(UUIDSchema()), [UUID(int=i) for i in range(size)]
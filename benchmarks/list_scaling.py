@@ -0,0 +1,40 @@
+import gc
+import sys
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+from district42 import schema
+
+from revolt import substitute
+
+SIZES = (10 ** 4, 10 ** 5, 10 ** 6)
+MAX_GROWTH = 3.0  # per-element time may grow this much between the smallest and largest size
+
+PATTERNS: Dict[str, Callable[[], Any]] = {
+    "head": lambda: schema.list([schema.int(0), ...]),
+    "tail": lambda: schema.list([..., schema.int(0)]),
+    "body": lambda: schema.list([..., schema.int(0), ...]),
+}
+
+
+def measure(pattern: Callable[[], Any], size: int) -> float:
+    value: List[Any] = [0] * size
+    gc.collect()
+    started = perf_counter()
+    substitute(pattern(), value)
+    return (perf_counter() - started) / size
+
+
+def main() -> int:
+    failed = False
+    for name, pattern in PATTERNS.items():
+        per_element = [measure(pattern, size) for size in SIZES]
+        growth = per_element[-1] / per_element[0]
+        timings = ", ".join(f"{size}: {t * 1e6:.2f}us" for size, t in zip(SIZES, per_element))
+        print(f"{name:>5} per element -> {timings} (growth {growth:.2f}x)")
+        failed = failed or (growth > MAX_GROWTH)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,147 @@
-from typing import Any
+import json
+from concurrent.futures import Executor
+from functools import partial
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
 
 from district42 import GenericSchema
 from district42.types import Schema
+from niltype import Nil
 
+from . import _pickling  # noqa: F401
+from ._cache_stats import CacheStats
+from ._interner import InternStats
+from ._patch import Patch
+from ._profiler import Profiler, ProfileStats
+from ._result_cache import ResultCache
 from ._substitutor import Substitutor
 from ._validator import SubstitutorValidator
 from ._version import version
+from .errors import SubstitutionError
 
 __version__ = version
-__all__ = ("substitute", "Substitutor", "SubstitutorValidator",)
+__all__ = ("substitute", "asubstitute", "resubstitute", "substitute_many", "substitute_jsonl",
+           "profile", "Substitutor", "SubstitutorValidator", "Profiler", "ProfileStats",
+           "CacheStats", "InternStats", "ResultCache", "enable_result_cache",
+           "disable_result_cache",)
+
+_Result = Union[GenericSchema, SubstitutionError]
 
 _substitutor = Substitutor()
+_result_cache: Optional[ResultCache] = None
+
+
+def enable_result_cache(max_size: int = 1024, policy: str = "lru") -> ResultCache:
+    global _result_cache
+    _result_cache = ResultCache(max_size, policy)
+    return _result_cache
+
+
+def disable_result_cache() -> None:
+    global _result_cache
+    _result_cache = None
+
+
+def substitute(schema: GenericSchema, value: Any, *, pool: Optional[Executor] = None,
+               chunk_size: int = 10_000, **kwargs: Any) -> Any:
+    kwargs.pop("_validated", None)  # plans validate their value unless a parent plan did
+    cache = _result_cache
+    if cache is not None:
+        # results are immutable schemas, errors are raised again every time
+        key = cache.make_key(schema, value, kwargs)
+        if key is not None:
+            result = cache.get(key)
+            if result is Nil:
+                result = cache.set(key, _substitute(schema, value, pool=pool,
+                                                    chunk_size=chunk_size, **kwargs))
+            return result
+    return _substitute(schema, value, pool=pool, chunk_size=chunk_size, **kwargs)
+
+
+def _substitute(schema: GenericSchema, value: Any, *, pool: Optional[Executor],
+                chunk_size: int, **kwargs: Any) -> Any:
+    if pool is not None:
+        return _substitutor._substitute_in_pool(schema, value, pool, chunk_size=chunk_size,
+                                                **kwargs)
+    return _substitutor.compile(schema)(value, **kwargs)
+
+
+async def asubstitute(schema: GenericSchema, value: Any, *,
+                      executor: Optional[Executor] = None, yield_every: int = 1000,
+                      **kwargs: Any) -> Any:
+    # results and errors are the ones substitute() gives: substituted in the executor
+    # if given, otherwise on the event loop, yielding to it every yield_every elements
+    # of a large list (keys of a wide dict)
+    if executor is not None:
+        from asyncio import get_running_loop  # not at module level, it adds ~60ms to import
+
+        loop = get_running_loop()
+        return await loop.run_in_executor(executor, partial(substitute, schema, value,
+                                                            **kwargs))
+
+    kwargs.pop("_validated", None)
+    cache = _result_cache
+    if cache is not None:
+        key = cache.make_key(schema, value, kwargs)
+        if key is not None:
+            result = cache.get(key)
+            if result is Nil:
+                result = cache.set(key, await _substitutor._asubstitute(
+                    schema, value, yield_every=yield_every, **kwargs))
+            return result
+    return await _substitutor._asubstitute(schema, value, yield_every=yield_every, **kwargs)
+
+
+def resubstitute(result: GenericSchema, schema: GenericSchema, patch: Patch,
+                 **kwargs: Any) -> GenericSchema:
+    return _substitutor.resubstitute(result, schema, patch, **kwargs)
+
+
+def profile(schema: GenericSchema, value: Any, *, profiler: Optional[Profiler] = None,
+            **kwargs: Any) -> Profiler:
+    kwargs.pop("_validated", None)
+    with _substitutor.profile(profiler) as profiler:
+        _substitutor.compile(schema)(value, **kwargs)
+    return profiler
+
+
+def substitute_many(schema: GenericSchema, values: Iterable[Any], *,
+                    pool: Optional[Executor] = None, chunk_size: int = 1000,
+                    **kwargs: Any) -> List[Union[GenericSchema, SubstitutionError]]:
+    kwargs.pop("_validated", None)
+    if pool is not None:
+        return _substitutor._substitute_many_in_pool(schema, values, pool,
+                                                     chunk_size=chunk_size, **kwargs)
+    plan = _substitutor.compile(schema)
+    results: List[Union[GenericSchema, SubstitutionError]] = []
+    for value in values:
+        try:
+            results.append(plan(value, **kwargs))
+        except SubstitutionError as e:
+            results.append(e)
+    return results
+
+
+def substitute_jsonl(schema: GenericSchema, lines: Iterable[Union[str, bytes]],
+                     **kwargs: Any) -> Iterator[Union[GenericSchema, SubstitutionError]]:
+    for _, result in _substitute_lines(schema, lines, **kwargs):
+        yield result
 
 
-def substitute(schema: GenericSchema, value: Any, **kwargs: Any) -> Any:
-    return schema.__accept__(_substitutor, value=value, **kwargs)
+def _substitute_lines(schema: GenericSchema, lines: Iterable[Union[str, bytes]],
+                      **kwargs: Any) -> Iterator[Tuple[int, _Result]]:
+    # blank lines (e.g. a trailing one) are skipped, line numbers count them
+    for lineno, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield lineno, SubstitutionError(f"Can't parse line {lineno}: {e}")
+            continue
+        try:
+            yield lineno, substitute(schema, value, **kwargs)
+        except SubstitutionError as e:
+            yield lineno, e
 
 
 Schema.__override__(Schema.__mod__.__name__, substitute)
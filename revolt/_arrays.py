@@ -0,0 +1,97 @@
+import sys
+from math import isinf
+from typing import Any, List, Optional
+
+from district42.types import FloatSchema, IntSchema, ListProps
+from niltype import Nil
+
+from .errors import SubstitutionError
+
+__all__ = ("is_array", "array_to_list", "check_array",)
+
+_ISCLOSE_REL_TOL = 1e-09  # math.isclose default
+# struct formats of numbers memoryview.tolist() supports
+_BUFFER_FORMATS = frozenset("bBhHiIlLqQnNfd?")
+
+
+def _numpy() -> Any:
+    # never imported here (it's slow to import), an ndarray value means it's already loaded
+    return sys.modules.get("numpy")
+
+
+def is_array(value: Any) -> bool:
+    if isinstance(value, (list, str, bytes, bytearray)):
+        return False
+    numpy = _numpy()
+    if (numpy is not None) and isinstance(value, numpy.ndarray):
+        return bool(value.ndim > 0)
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return False
+    # 0-d buffers are scalars (numpy.generic too), other formats can't be listed
+    return (view.ndim == 1) and (view.format in _BUFFER_FORMATS)
+
+
+def array_to_list(value: Any) -> List[Any]:
+    numpy = _numpy()
+    try:
+        if (numpy is not None) and isinstance(value, numpy.ndarray):
+            return value.tolist()  # type: ignore
+        return memoryview(value).tolist()
+    except (TypeError, ValueError, NotImplementedError) as e:
+        raise SubstitutionError(f"Can't convert {type(value)} to list: {e}")
+
+
+def _check_len(props: ListProps, length: int) -> bool:
+    if (props.len is not Nil) and (length != props.len):
+        return False
+    if (props.min_len is not Nil) and (length < props.min_len):
+        return False
+    if (props.max_len is not Nil) and (length > props.max_len):
+        return False
+    return True
+
+
+def check_array(props: ListProps, value: Any) -> Optional[bool]:
+    # vectorized counterpart of validating every element against the list type,
+    # None means the array can't be checked this way
+    type_schema = props.type
+    numpy = _numpy()
+    if numpy is None or not isinstance(type_schema, (IntSchema, FloatSchema)):
+        return None
+
+    array = numpy.asarray(value)
+    if array.ndim != 1:
+        return None
+    if not _check_len(props, len(array)):
+        return False
+
+    is_float = isinstance(type_schema, FloatSchema)
+    if array.dtype.kind not in ("f" if is_float else "iub"):
+        return False
+    if len(array) == 0:
+        return True
+    if is_float:
+        array = array.astype(numpy.float64)  # elements are checked as python floats
+
+    type_props = type_schema.props
+    if type_props.value is not Nil:
+        if is_float:
+            expected = type_props.value
+            if isinf(expected):
+                if not bool((array == expected).all()):
+                    return False
+            else:
+                diff = numpy.abs(array - expected)
+                tolerance = _ISCLOSE_REL_TOL * numpy.maximum(numpy.abs(array), abs(expected))
+                is_close = numpy.isfinite(array) & (diff <= tolerance)
+                if not bool(((array == expected) | is_close).all()):
+                    return False
+        elif not bool((array == type_props.value).all()):
+            return False
+    if (type_props.min is not Nil) and bool((array < type_props.min).any()):
+        return False
+    if (type_props.max is not Nil) and bool((array > type_props.max).any()):
+        return False
+    return True
@@ -0,0 +1,20 @@
+__all__ = ("CacheStats",)
+
+
+class CacheStats:
+    __slots__ = ("hits", "misses", "size", "max_size",)
+
+    def __init__(self, hits: int, misses: int, size: int, max_size: int) -> None:
+        self.hits = hits
+        self.misses = misses
+        self.size = size
+        self.max_size = max_size
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(hits={self.hits}, misses={self.misses}, "
+                f"size={self.size}, max_size={self.max_size}, hit_rate={self.hit_rate:.2f})")
@@ -0,0 +1,81 @@
+import json
+import sys
+from argparse import ArgumentParser, FileType
+from importlib import import_module
+from typing import Any, List, Optional
+
+from district42 import GenericSchema
+from district42.types import Schema
+
+from . import _substitute_lines, profile
+from .errors import SubstitutionError
+
+__all__ = ("main", "load_schema",)
+
+
+def load_schema(reference: str) -> GenericSchema:
+    module_name, sep, attr_path = reference.partition(":")
+    if not sep or not module_name or not attr_path:
+        raise ValueError(f"Schema reference must be 'module:attr', {reference!r} given")
+
+    obj: Any = import_module(module_name)
+    for attr in attr_path.split("."):
+        obj = getattr(obj, attr)
+
+    if not isinstance(obj, Schema):
+        raise ValueError(f"{reference!r} is not a schema")
+    return obj
+
+
+def make_parser() -> ArgumentParser:
+    parser = ArgumentParser(prog="revolt", description="Value substitutor for district42 schema")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    jsonl = subparsers.add_parser("jsonl", help="substitute every line of a JSON Lines file")
+    jsonl.add_argument("schema", help="schema reference, e.g. 'package.schemas:UserSchema'")
+    jsonl.add_argument("file", nargs="?", type=FileType("r"), default="-",
+                       help="JSON Lines file (default: stdin)")
+
+    prof = subparsers.add_parser("profile", help="print substitution cost by schema path "
+                                                 "in collapsed stack format (flamegraph)")
+    prof.add_argument("schema", help="schema reference, e.g. 'package.schemas:UserSchema'")
+    prof.add_argument("file", nargs="?", type=FileType("r"), default="-",
+                      help="JSON file (default: stdin)")
+    prof.add_argument("--report", action="store_true",
+                      help="print a table by visit_* method and path instead")
+    return parser
+
+
+def main_profile(schema: GenericSchema, args: Any) -> int:
+    with args.file:
+        value = json.load(args.file)
+    try:
+        profiler = profile(schema, value)
+    except SubstitutionError as e:
+        sys.stderr.write(f"{e}\n")
+        return 1
+    sys.stdout.write(profiler.report() + "\n" if args.report else profiler.collapsed())
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    try:
+        schema = load_schema(args.schema)
+    except (ValueError, ImportError, AttributeError) as e:
+        parser.error(f"can't load schema {args.schema!r}: {e}")
+    if args.command == "profile":
+        return main_profile(schema, args)
+
+    has_errors = False
+    with args.file:
+        for lineno, result in _substitute_lines(schema, args.file):
+            if isinstance(result, SubstitutionError):
+                has_errors = True
+                record = {"line": lineno, "error": str(result)}
+            else:
+                record = {"line": lineno, "result": repr(result)}
+            sys.stdout.write(json.dumps(record) + "\n")
+
+    return 1 if has_errors else 0
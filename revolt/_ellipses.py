@@ -0,0 +1,8 @@
+from typing import Any, FrozenSet, Iterable
+
+__all__ = ("find_ellipses",)
+
+
+def find_ellipses(value: Iterable[Any]) -> FrozenSet[int]:
+    # identity check, `... in value` would call __eq__ of every element
+    return frozenset(index for index, val in enumerate(value) if val is ...)
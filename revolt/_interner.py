@@ -0,0 +1,128 @@
+from sys import getsizeof
+from threading import Lock
+from typing import Any, Dict, Hashable, List, Tuple
+from weakref import WeakValueDictionary
+
+from district42 import GenericSchema
+from district42.types import Schema
+
+__all__ = ("Interner", "InternStats",)
+
+_CONTAINER_TYPES = (list, tuple, dict)
+_SCALAR_TYPES = frozenset({type(None), bool, int, str, bytes})
+
+
+class InternStats:
+    __slots__ = ("nodes", "deduplicated", "saved_bytes",)
+
+    def __init__(self, nodes: int, deduplicated: int, saved_bytes: int) -> None:
+        self.nodes = nodes
+        self.deduplicated = deduplicated
+        self.saved_bytes = saved_bytes
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(nodes={self.nodes}, "
+                f"deduplicated={self.deduplicated}, saved_bytes={self.saved_bytes})")
+
+
+def _node_size(schema: GenericSchema) -> int:
+    # shallow sizes of the node, its props and containers, children are counted on their own
+    props = schema.props
+    size = getsizeof(schema) + getsizeof(vars(schema)) + getsizeof(props)
+    size += getsizeof(dict.fromkeys(props))
+    for name in props:
+        val = props.get(name)
+        if isinstance(val, (list, tuple)):
+            size += getsizeof(val)
+        elif isinstance(val, dict):
+            size += getsizeof(val) + sum(getsizeof(entry) for entry in val.values())
+    return size
+
+
+class Interner:
+    def __init__(self) -> None:
+        # canonical nodes are keyed by children identities, a child lives as long as its parent
+        self._nodes: "WeakValueDictionary[Hashable, GenericSchema]" = WeakValueDictionary()
+        self._lock = Lock()
+        self._deduplicated = 0
+        self._saved_bytes = 0
+        # nodes of the same type and container lengths have the same size
+        self._sizes: Dict[Hashable, int] = {}
+
+    def intern(self, schema: GenericSchema) -> GenericSchema:
+        with self._lock:
+            return self._intern(schema)
+
+    def stats(self) -> InternStats:
+        return InternStats(len(self._nodes), self._deduplicated, self._saved_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes.clear()
+            self._deduplicated = 0
+            self._saved_bytes = 0
+
+    def _intern(self, schema: GenericSchema) -> GenericSchema:
+        props = schema.props
+        updates: Dict[str, Any] = {}
+        items: List[Tuple[str, Hashable]] = []
+        for name in props:
+            val = props.get(name)
+            canonical, key = self._intern_prop(val)
+            if canonical is not val:
+                updates[name] = canonical
+            items.append((name, key))
+        items.sort()  # names are unique, keys are never compared
+        node_key = (schema.__class__, tuple(items))
+
+        try:
+            existing = self._nodes.get(node_key)
+        except TypeError:  # props of custom types may be unhashable
+            return schema
+        if existing is not None:
+            self._deduplicated += 1
+            self._saved_bytes += self._node_size(schema, items)
+            return existing
+
+        if len(updates) > 0:
+            schema = schema.__class__(props.update(**updates))
+        self._nodes[node_key] = schema
+        return schema
+
+    def _node_size(self, schema: GenericSchema, items: List[Tuple[str, Hashable]]) -> int:
+        shape = (schema.__class__, tuple(
+            (name, len(key[1]) if key[0] in _CONTAINER_TYPES else -1)
+            if isinstance(key, tuple) else (name, 0) for name, key in items))
+        size = self._sizes.get(shape)
+        if size is None:
+            size = self._sizes[shape] = _node_size(schema)
+        return size
+
+    def _intern_prop(self, val: Any) -> Tuple[Any, Hashable]:
+        val_type = type(val)
+        if val_type in _SCALAR_TYPES:
+            return val, (val_type, val)
+        if isinstance(val, Schema):
+            canonical = self._intern(val)
+            # other keys are tuples, ids of canonical nodes can't be mistaken for them
+            return canonical, id(canonical)
+        if isinstance(val, (list, tuple)):
+            items = [self._intern_prop(x) for x in val]
+            key = (type(val), tuple(key for _, key in items))
+            if all(x is y for (x, _), y in zip(items, val)):
+                return val, key
+            canonicals = [x for x, _ in items]
+            return (canonicals if isinstance(val, list) else tuple(canonicals)), key
+        if isinstance(val, dict):
+            keys: Dict[Any, Any] = {}
+            key_items = []
+            is_changed = False
+            for key, (sch, is_optional) in val.items():
+                canonical, sch_key = self._intern_prop(sch)
+                keys[key] = (canonical, is_optional)
+                key_items.append(((type(key), key), sch_key, is_optional))
+                is_changed = is_changed or (canonical is not sch)
+            return (keys if is_changed else val), (dict, tuple(key_items))
+        if isinstance(val, float):
+            return val, (float, val.hex())  # -0.0 == 0.0
+        return val, (type(val), val)
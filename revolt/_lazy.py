@@ -0,0 +1,121 @@
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+    overload,
+)
+
+__all__ = ("LazyElements", "LazyKeys", "is_native", "snapshot",)
+
+_PENDING = object()
+_SCALAR_TYPES = (type(None), bool, int, float, str, bytes)
+
+
+def snapshot(value: Any) -> Any:
+    # lazy nodes read the value after the call returns, so the value they read is a copy
+    # made when it's validated: taken once for the whole value, nested nodes share it
+    if isinstance(value, list):
+        return [snapshot(x) for x in value]
+    if isinstance(value, dict):
+        return {key: snapshot(val) for key, val in value.items()}
+    return value
+
+
+def is_native(value: Any) -> bool:
+    # whether district42.from_native converts the value (... inside it can't be converted)
+    if isinstance(value, _SCALAR_TYPES):
+        return True
+    if isinstance(value, list):
+        return all(is_native(x) for x in value)
+    if isinstance(value, dict):
+        return all(is_native(x) for x in value.values())
+    return False
+
+
+class LazyElements(Sequence[Any]):
+    def __init__(self, values: List[Any], convert: Callable[[Any], Any],
+                 resolved: Optional[Dict[int, Any]] = None) -> None:
+        self._values = values  # a snapshot (see snapshot())
+        self._convert = convert
+        self._items: List[Any] = [_PENDING] * len(values)
+        for index, item in (resolved or {}).items():
+            self._items[index] = item
+
+    def _resolve(self, index: int) -> Any:
+        item = self._items[index]
+        if item is _PENDING:
+            item = self._items[index] = self._convert(self._values[index])
+        return item
+
+    @overload
+    def __getitem__(self, index: int) -> Any:
+        pass
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]:
+        pass
+
+    def __getitem__(self, index: Union[int, slice]) -> Any:
+        if isinstance(index, slice):
+            return [self._resolve(i) for i in range(*index.indices(len(self._items)))]
+        return self._resolve(range(len(self._items))[index])
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self._items)):
+            yield self._resolve(index)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, (list, LazyElements)):
+            return NotImplemented
+        return list(self) == list(other)
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self)!r})"
+
+    def __reduce__(self) -> Any:
+        return (list, (list(self),))
+
+
+class LazyKeys(Mapping[Any, Tuple[Any, bool]]):
+    def __init__(self, order: Iterable[Any], values: Mapping[Any, Any],
+                 convert: Callable[[Any, Any], Tuple[Any, bool]],
+                 resolved: Optional[Dict[Any, Tuple[Any, bool]]] = None) -> None:
+        self._values = values  # a snapshot (see snapshot())
+        self._convert = convert
+        self._keys: Dict[Any, Any] = dict.fromkeys(order, _PENDING)
+        self._keys.update(resolved or {})
+
+    def __getitem__(self, key: Any) -> Tuple[Any, bool]:
+        entry = self._keys[key]
+        if entry is _PENDING:
+            entry = self._keys[key] = self._convert(key, self._values[key])
+        return cast(Tuple[Any, bool], entry)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._keys
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({dict(self.items())!r})"
+
+    def __reduce__(self) -> Any:
+        return (dict, (dict(self.items()),))
@@ -0,0 +1,177 @@
+from math import isclose
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Type
+
+from district42 import GenericSchema, SchemaVisitor
+from district42.types import (
+    AnySchema,
+    BoolSchema,
+    BytesSchema,
+    ConstSchema,
+    DictSchema,
+    FloatSchema,
+    GenericTypeAliasSchema,
+    IntSchema,
+    ListSchema,
+    NoneSchema,
+    StrSchema,
+    TypeAliasPropsType,
+)
+from district42.utils import is_ellipsis
+from niltype import Nil
+
+from ._arrays import is_array
+
+__all__ = ("BodyMatcher", "Check",)
+
+Check = Callable[[Any], bool]
+Literal = Tuple[Type[Any], Any]
+
+
+def _accept_all(value: Any) -> bool:
+    return True
+
+
+# checks are cheap and may accept an invalid value, but never reject a valid one
+class _CheckBuilder(SchemaVisitor[Check]):
+    def _typed(self, expected_type: Type[Any], expected_val: Any = Nil) -> Check:
+        if expected_val is Nil:
+            return lambda value: isinstance(value, expected_type)
+        return lambda value: isinstance(value, expected_type) and (value == expected_val)
+
+    def visit_none(self, schema: NoneSchema, **kwargs: Any) -> Check:
+        return lambda value: value is None
+
+    def visit_bool(self, schema: BoolSchema, **kwargs: Any) -> Check:
+        return self._typed(bool, schema.props.value)
+
+    def visit_int(self, schema: IntSchema, **kwargs: Any) -> Check:
+        return self._typed(int, schema.props.value)
+
+    def visit_float(self, schema: FloatSchema, **kwargs: Any) -> Check:
+        expected_val = schema.props.value
+        if expected_val is Nil:
+            return self._typed(float)
+        return lambda value: isinstance(value, float) and isclose(value, expected_val)
+
+    def visit_str(self, schema: StrSchema, **kwargs: Any) -> Check:
+        return self._typed(str, schema.props.value)
+
+    def visit_bytes(self, schema: BytesSchema, **kwargs: Any) -> Check:
+        return self._typed(bytes, schema.props.value)
+
+    def visit_list(self, schema: ListSchema, **kwargs: Any) -> Check:
+        return lambda value: isinstance(value, list) or is_array(value)
+
+    def visit_dict(self, schema: DictSchema, **kwargs: Any) -> Check:
+        if schema.props.keys is Nil:
+            return self._typed(dict)
+
+        keys = schema.props.keys
+        is_relaxed = ... in keys
+        key_checks = [(key, val.__accept__(self)) for key, (val, _) in keys.items()
+                      if not is_ellipsis(key)]
+
+        def check(value: Any) -> bool:
+            if not isinstance(value, dict):
+                return False
+            for key, key_check in key_checks:
+                if (key in value) and not key_check(value[key]):
+                    return False
+            return is_relaxed or all(key in keys for key in value)
+
+        return check
+
+    def visit_any(self, schema: AnySchema, **kwargs: Any) -> Check:
+        if schema.props.types is Nil:
+            return _accept_all
+        checks = [x.__accept__(self) for x in schema.props.types]
+        return lambda value: any(check(value) for check in checks)
+
+    def visit_const(self, schema: ConstSchema, **kwargs: Any) -> Check:
+        expected_val = schema.props.value
+        if expected_val is Nil:
+            return _accept_all
+        return lambda value: not (value != expected_val)
+
+    def visit_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType],
+                         **kwargs: Any) -> Check:
+        return schema.props.type.__accept__(self)
+
+    def __getattr__(self, name: Any) -> Any:
+        # custom types can't be checked without their validator
+        if isinstance(name, str) and name.startswith("visit_"):
+            return lambda schema, **kwargs: _accept_all
+        return super().__getattr__(name)
+
+
+# KMP needs literals accepting either the same or disjoint sets of values
+_LITERAL_TYPES = {NoneSchema: type(None), BoolSchema: bool, IntSchema: int,
+                  StrSchema: str, BytesSchema: bytes}
+
+
+def _as_literal(schema: GenericSchema) -> Optional[Literal]:
+    expected_type = _LITERAL_TYPES.get(type(schema))
+    if expected_type is None:
+        return None
+    if expected_type is type(None):
+        return (expected_type, None)
+    if schema.props.value is Nil:
+        return None
+    return (expected_type, schema.props.value)
+
+
+class BodyMatcher:
+    def __init__(self, elements: List[GenericSchema]) -> None:
+        builder = _CheckBuilder()
+        self._checks = [x.__accept__(builder) for x in elements]
+        self._literals = self._make_literals(elements)
+        self._failure = self._make_failure(self._literals) if self._literals else []
+
+    def _make_literals(self, elements: List[GenericSchema]) -> Optional[List[Literal]]:
+        literals = []
+        for element in elements:
+            literal = _as_literal(element)
+            if literal is None:
+                return None
+            literals.append(literal)
+        types = {x[0] for x in literals}
+        if (bool in types) and (int in types):
+            return None  # True == 1
+        return literals
+
+    def _make_failure(self, literals: List[Literal]) -> List[int]:
+        failure = [0] * len(literals)
+        k = 0
+        for q in range(1, len(literals)):
+            while k > 0 and literals[q] != literals[k]:
+                k = failure[k - 1]
+            if literals[q] == literals[k]:
+                k += 1
+            failure[q] = k
+        return failure
+
+    def _kmp_candidates(self, value: List[Any]) -> Iterator[int]:
+        checks, failure, size = self._checks, self._failure, len(self._checks)
+        q = 0
+        for index, val in enumerate(value):
+            while q > 0 and not checks[q](val):
+                q = failure[q - 1]
+            if checks[q](val):
+                q += 1
+            if q == size:
+                yield index - size + 1
+                q = failure[q - 1]
+
+    def candidates(self, value: List[Any]) -> Iterator[int]:
+        # yields positions in order, including every position the elements actually match at
+        if self._literals is not None:
+            yield from self._kmp_candidates(value)
+            return
+
+        checks = self._checks
+        for index in range(len(value) - len(checks) + 1):
+            for offset, check in enumerate(checks):
+                if not check(value[index + offset]):
+                    break
+            else:
+                yield index
@@ -0,0 +1,34 @@
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, Type
+
+from district42 import GenericSchema
+
+from ._cache_stats import CacheStats
+
+__all__ = ("NativeMemo",)
+
+# exact types only: immutable, hashable and converted by value alone
+_SCALAR_TYPES: FrozenSet[Type[Any]] = frozenset({type(None), bool, int, float, str, bytes})
+
+
+class NativeMemo:
+    def __init__(self, convert: Callable[[Any], GenericSchema], max_size: int) -> None:
+        self._convert = convert
+        # typed: 1, 1.0 and True are equal keys otherwise
+        self._cached = lru_cache(maxsize=max_size, typed=True)(convert)
+
+    def __call__(self, value: Any) -> GenericSchema:
+        value_type = type(value)
+        if value_type not in _SCALAR_TYPES:
+            return self._convert(value)
+        if value_type is float and (value == 0.0 or value != value):
+            # -0.0 would get the schema of 0.0, nan never equals its key
+            return self._convert(value)
+        return self._cached(value)
+
+    def stats(self) -> CacheStats:
+        info = self._cached.cache_info()
+        return CacheStats(info.hits, info.misses, info.currsize, info.maxsize or 0)
+
+    def clear(self) -> None:
+        self._cached.cache_clear()
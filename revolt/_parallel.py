@@ -0,0 +1,140 @@
+from concurrent.futures import Executor, Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+from district42 import GenericSchema
+from district42.types import DictSchema, ListSchema
+from district42.utils import is_ellipsis
+from niltype import Nil
+from th import PathHolder
+from valera.errors import ExtraKeyValidationError, ValidationError
+
+from ._validator import SubstitutorValidator
+
+__all__ = ("validate_elements", "validate_items", "validate_values", "validate_list",
+           "validate_dict", "validate_batch", "list_chunks", "dict_chunks", "extra_key_errors",)
+
+_Items = List[Tuple[Any, GenericSchema, Any]]
+
+# per worker process, caches of the validator survive between chunks
+_validator = SubstitutorValidator()
+
+
+def _chunks(values: List[Any], size: int, start: int = 0,
+            stop: Optional[int] = None) -> Iterator[Tuple[int, List[Any]]]:
+    stop = len(values) if stop is None else stop
+    for index in range(start, stop, size):
+        yield index, values[index:min(index + size, stop)]
+
+
+def _collect(futures: List["Future[List[ValidationError]]"],
+             fail_fast: bool) -> List[ValidationError]:
+    errors: List[ValidationError] = []
+    for future in futures:
+        errors += future.result()
+        if fail_fast and len(errors) > 0:
+            break
+    for future in futures:
+        future.cancel()
+    return errors
+
+
+def validate_elements(schema: GenericSchema, values: List[Any], start: int,
+                      fail_fast: bool) -> List[ValidationError]:
+    errors: List[ValidationError] = []
+    for index, value in enumerate(values, start):
+        res = schema.__accept__(_validator, value=value, path=PathHolder()[index],
+                                fail_fast=fail_fast)
+        errors += res.get_errors()
+        if fail_fast and len(errors) > 0:
+            break
+    return errors
+
+
+def validate_items(items: _Items, fail_fast: bool) -> List[ValidationError]:
+    errors: List[ValidationError] = []
+    for key, schema, value in items:
+        res = schema.__accept__(_validator, value=value, path=PathHolder()[key],
+                                fail_fast=fail_fast)
+        errors += res.get_errors()
+        if fail_fast and len(errors) > 0:
+            break
+    return errors
+
+
+def validate_values(schema: GenericSchema, values: List[Any],
+                    fail_fast: bool) -> List[List[ValidationError]]:
+    return [schema.__accept__(_validator, value=value, fail_fast=fail_fast).get_errors()
+            for value in values]
+
+
+def list_chunks(schema: ListSchema, value: Any, chunk_size: int,
+                fail_fast: bool) -> Tuple[List[ValidationError], List[Tuple[int, List[Any]]]]:
+    # the list itself (type and length) first, the same way visit_list does it,
+    # its elements are validated chunk by chunk (see validate_elements) if it's valid
+    errors = schema.__class__(schema.props.update(type=Nil)).__accept__(
+        _validator, value=value, fail_fast=fail_fast).get_errors()
+    if len(errors) > 0:
+        return errors, []
+
+    # leading and trailing ... are not validated (see SubstitutorValidator.visit_list)
+    start = 1 if (len(value) > 0) and (value[0] is ...) else 0
+    stop = len(value) - 1 if (len(value) > start) and (value[-1] is ...) else len(value)
+    return errors, list(_chunks(value, chunk_size, start, stop))
+
+
+def validate_list(schema: ListSchema, value: List[Any], executor: Executor, chunk_size: int,
+                  fail_fast: bool) -> List[ValidationError]:
+    errors, chunks = list_chunks(schema, value, chunk_size, fail_fast)
+    type_schema = cast(GenericSchema, schema.props.type)
+    futures = [executor.submit(validate_elements, type_schema, chunk, index, fail_fast)
+               for index, chunk in chunks]
+    errors += _collect(futures, fail_fast)
+    return errors
+
+
+def dict_chunks(schema: DictSchema, value: Any, chunk_size: int,
+                fail_fast: bool) -> Tuple[List[ValidationError], List[_Items]]:
+    # the same errors in the same order as SubstitutorValidator.visit_dict:
+    # the dict itself, its items chunk by chunk (see validate_items), then extra keys
+    errors = schema.__class__(schema.props.update(keys=Nil)).__accept__(
+        _validator, value=value, fail_fast=fail_fast).get_errors()
+    if len(errors) > 0:
+        return errors, []
+
+    keys = cast(Dict[Any, Tuple[GenericSchema, bool]], schema.props.keys)
+    items = [(key, val, value[key]) for key, (val, _) in keys.items()
+             if not is_ellipsis(key) and (key in value)]
+    return errors, [chunk for _, chunk in _chunks(items, chunk_size)]
+
+
+def extra_key_errors(schema: DictSchema, value: Dict[Any, Any],
+                     fail_fast: bool) -> List[ValidationError]:
+    errors: List[ValidationError] = []
+    keys = cast(Dict[Any, Tuple[GenericSchema, bool]], schema.props.keys)
+    if (... not in keys) and (set(keys) != set(value)):
+        for key in value:
+            if key not in keys:
+                errors.append(ExtraKeyValidationError(PathHolder(), value, key))
+                if fail_fast:
+                    break
+    return errors
+
+
+def validate_dict(schema: DictSchema, value: Any, executor: Executor, chunk_size: int,
+                  fail_fast: bool) -> List[ValidationError]:
+    errors, chunks = dict_chunks(schema, value, chunk_size, fail_fast)
+    if len(errors) > 0:
+        return errors
+
+    futures = [executor.submit(validate_items, chunk, fail_fast) for chunk in chunks]
+    errors += _collect(futures, fail_fast)
+    if fail_fast and len(errors) > 0:
+        return errors
+    return errors + extra_key_errors(schema, value, fail_fast)
+
+
+def validate_batch(schema: GenericSchema, values: List[Any], executor: Executor,
+                   chunk_size: int, fail_fast: bool) -> List[List[ValidationError]]:
+    futures = [executor.submit(validate_values, schema, chunk, fail_fast)
+               for _, chunk in _chunks(values, chunk_size)]
+    return [errors for future in futures for errors in future.result()]
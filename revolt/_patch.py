@@ -0,0 +1,42 @@
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from district42 import GenericSchema
+from district42.types import ListSchema
+from district42.utils import is_ellipsis
+from niltype import Nil
+
+from .errors import SubstitutionError
+
+__all__ = ("Patch", "PatchPath", "parse_path", "element_schema",)
+
+# "/users/0/name" (JSON Pointer) or ("users", 0, "name") for keys that aren't strings
+PatchPath = Union[str, Sequence[Any]]
+Patch = Iterable[Tuple[PatchPath, Any]]
+
+
+def parse_path(path: PatchPath) -> Tuple[Any, ...]:
+    if not isinstance(path, str):
+        return tuple(path)
+    if path == "":
+        return ()
+    if not path.startswith("/"):
+        raise ValueError(f"Path must be empty or start with '/', {path!r} given")
+    return tuple(x.replace("~1", "/").replace("~0", "~") for x in path[1:].split("/"))
+
+
+def element_schema(schema: ListSchema, size: int, index: int) -> Optional[GenericSchema]:
+    # the schema the element at `index` was substituted with, None for from_native elements
+    if schema.props.type is not Nil:
+        return schema.props.type
+    if schema.props.elements is Nil:
+        return None
+
+    elements: List[GenericSchema] = schema.props.elements
+    if (len(elements) > 2) and is_ellipsis(elements[0]) and is_ellipsis(elements[-1]):
+        raise SubstitutionError(f"Can't patch index {index}: body position is unknown")
+    if (len(elements) >= 2) and is_ellipsis(elements[-1]):
+        return elements[index] if index < len(elements) - 1 else None
+    if (len(elements) >= 1) and is_ellipsis(elements[0]):
+        offset = index - (size - (len(elements) - 1))
+        return elements[1 + offset] if offset >= 0 else None
+    return elements[index]
@@ -0,0 +1,21 @@
+import copyreg
+from typing import Any, Tuple
+
+from niltype import NilType
+from th import PathHolder
+
+__all__ = ()
+
+
+# default pickling of both types never works: Nil is an enum member whose value is
+# a private singleton, PathHolder turns every attribute lookup into a path segment
+def _reduce_nil(nil: NilType) -> Tuple[Any, ...]:
+    return (getattr, (NilType, "_nil"))
+
+
+def _reduce_path_holder(path: PathHolder) -> Tuple[Any, ...]:
+    return (type(path), (path.__name__, list(path)))
+
+
+copyreg.pickle(NilType, _reduce_nil)
+copyreg.pickle(PathHolder, _reduce_path_holder)
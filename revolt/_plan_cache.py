@@ -0,0 +1,45 @@
+from threading import RLock
+from typing import Any, Callable, Dict, Generic, Optional, Tuple, TypeVar
+from weakref import ReferenceType, ref
+
+from district42 import GenericSchema
+
+__all__ = ("Plan", "PlanCache",)
+
+Plan = Callable[..., Any]
+PlanType = TypeVar("PlanType")
+
+
+# reads are single dict lookups and stay lock-free, writes and evictions are serialized
+# (reentrant: an eviction may run from a GC pass triggered inside set())
+class PlanCache(Generic[PlanType]):
+    def __init__(self) -> None:
+        self._plans: Dict[int, Tuple["ReferenceType[GenericSchema]", PlanType]] = {}
+        self._lock = RLock()
+
+    def get(self, schema: GenericSchema) -> Optional[PlanType]:
+        entry = self._plans.get(id(schema))
+        if (entry is None) or (entry[0]() is not schema):
+            return None
+        return entry[1]
+
+    def set(self, schema: GenericSchema, plan: PlanType) -> PlanType:
+        key = id(schema)
+
+        def evict(schema_ref: "ReferenceType[GenericSchema]") -> None:
+            with self._lock:
+                entry = self._plans.get(key)
+                if (entry is not None) and (entry[0] is schema_ref):
+                    del self._plans[key]
+
+        entry = (ref(schema, evict), plan)
+        with self._lock:
+            self._plans[key] = entry
+        return plan
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def __len__(self) -> int:
+        return len(self._plans)
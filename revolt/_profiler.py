@@ -0,0 +1,197 @@
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+from district42 import GenericSchema
+
+from ._plan_cache import Plan
+from .errors import SubstitutionError
+
+__all__ = ("Profiler", "ProfileStats", "Path", "ROOT", "format_path", "visit_name",)
+
+Path = Tuple[str, ...]
+ROOT: Path = ("root",)
+
+
+class _VisitName:
+    def __getattr__(self, name: str) -> Callable[..., str]:
+        return lambda schema, **kwargs: name
+
+
+_visit_name = _VisitName()
+
+
+def visit_name(schema: GenericSchema) -> str:
+    return cast(str, schema.__accept__(_visit_name))  # type: ignore
+
+
+def format_path(path: Path) -> str:
+    return "".join(x if (i == 0 or x[0] in "[<") else f".{x}" for i, x in enumerate(path))
+
+
+class ProfileStats:
+    __slots__ = ("calls", "time", "self_time", "errors", "discarded",)
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.time = 0.0
+        self.self_time = 0.0
+        self.errors = 0
+        self.discarded = 0
+
+    def add(self, other: "ProfileStats") -> None:
+        self.calls += other.calls
+        self.time += other.time
+        self.self_time += other.self_time
+        self.errors += other.errors
+        self.discarded += other.discarded
+
+    def __repr__(self) -> str:
+        return (f"{self.__class__.__name__}(calls={self.calls}, time={self.time:.6f}, "
+                f"self_time={self.self_time:.6f}, errors={self.errors}, "
+                f"discarded={self.discarded})")
+
+
+class _Frame:
+    __slots__ = ("path", "children_time",)
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.children_time = 0.0
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self._stats: Dict[Tuple[Path, str], ProfileStats] = {}
+        self._stack: List[_Frame] = []
+        self._last_error: Optional[BaseException] = None
+        # profiled plans are compiled per path, the same schema may appear at several paths
+        self._plans: Dict[Tuple[int, Path], Tuple[GenericSchema, Plan]] = {}
+        # paths of nested schemas by the path of their parent (see child_path)
+        self._children: Dict[Tuple[Path, int], Path] = {}
+        self._visits: Dict[Path, str] = {}
+        # validation of nested values runs in frames of the parent validation,
+        # outside the visit_* frame of its path (see by_method)
+        self._outer_validation: Dict[Path, float] = {}
+
+    @property
+    def stats(self) -> Dict[Tuple[Path, str], ProfileStats]:
+        return dict(self._stats)
+
+    def by_method(self) -> Dict[str, ProfileStats]:
+        # validation of a node counts for its visit_* method, calls are counted once
+        methods: Dict[str, ProfileStats] = {}
+        for (path, method), stats in self._stats.items():
+            if (method == "validate") and (path in self._visits):
+                entry = methods.setdefault(self._visits[path], ProfileStats())
+                entry.time += self._outer_validation.get(path, 0.0)
+                entry.self_time += stats.self_time
+                entry.errors += stats.errors
+            else:
+                methods.setdefault(method, ProfileStats()).add(stats)
+        return methods
+
+    def by_path(self) -> Dict[Path, ProfileStats]:
+        paths: Dict[Path, ProfileStats] = {}
+        for (path, _), stats in self._stats.items():
+            paths.setdefault(path, ProfileStats()).add(stats)
+        return paths
+
+    def clear(self) -> None:
+        self._stats.clear()
+        self._outer_validation.clear()
+        self._last_error = None
+
+    def current_path(self) -> Path:
+        return self._stack[-1].path if self._stack else ROOT
+
+    def get_plan(self, schema: GenericSchema, path: Path) -> Optional[Plan]:
+        entry = self._plans.get((id(schema), path))
+        if (entry is None) or (entry[0] is not schema):
+            return None
+        return entry[1]
+
+    def set_plan(self, schema: GenericSchema, path: Path, plan: Plan,
+                 parent: Optional[Path] = None) -> Plan:
+        self._plans[(id(schema), path)] = (schema, plan)  # keeps the schema id unique
+        # a type alias shares the path of its type, which is compiled (and validated) first
+        self._visits.setdefault(path, visit_name(schema))
+        if parent is not None:
+            self._children[(parent, id(schema))] = path
+        return plan
+
+    def child_path(self, schema: GenericSchema) -> Optional[Path]:
+        # path a nested schema was compiled at, relative to the running frame
+        return self._children.get((self.current_path(), id(schema)))
+
+    def _entry(self, path: Path, method: str) -> ProfileStats:
+        stats = self._stats.get((path, method))
+        if stats is None:
+            stats = self._stats[(path, method)] = ProfileStats()
+        return stats
+
+    def wrap(self, path: Path, method: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        def profiled(*args: Any, **kwargs: Any) -> Any:
+            return self.call(path, method, fn, *args, **kwargs)
+
+        return profiled
+
+    def call(self, path: Path, method: str, fn: Callable[..., Any], /, *args: Any,
+             **kwargs: Any) -> Any:
+        # the entry is looked up on every call, so clear() resets counters of compiled plans
+        stats = self._entry(path, method)
+        frame = _Frame(path)
+        stack = self._stack
+        is_outer = (method == "validate") and ((not stack) or (stack[-1].path != path))
+        stack.append(frame)
+        started = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        except SubstitutionError as e:
+            if e is not self._last_error:  # counted where raised, not in every parent
+                self._last_error = e
+                stats.errors += 1
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            stack.pop()
+            if stack:
+                stack[-1].children_time += elapsed
+            stats.calls += 1
+            stats.time += elapsed
+            stats.self_time += elapsed - frame.children_time
+            if is_outer:
+                self._outer_validation[path] = self._outer_validation.get(path, 0.0) + elapsed
+
+    def discard_hook(self, path: Path, method: str) -> Callable[[], None]:
+        def discarded() -> None:
+            self._entry(path, method).discarded += 1
+        return discarded
+
+    def collapsed(self) -> str:
+        # "a;b;c count" lines for flamegraph tools, counts are microseconds of self time
+        stacks: Dict[str, int] = {}
+        for (path, method), stats in self._stats.items():
+            frames = path if method.startswith("visit_") else (*path, f"({method})")
+            stack = ";".join(frame.replace(";", ",") for frame in frames)
+            stacks[stack] = stacks.get(stack, 0) + round(stats.self_time * 1_000_000)
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.items() if count > 0)
+
+    def report(self, limit: Optional[int] = 20) -> str:
+        header = f"{'':<40} {'calls':>9} {'time':>10} {'self':>10} {'errors':>7} {'discarded':>9}"
+
+        def row(name: str, stats: ProfileStats) -> str:
+            return (f"{name:<40} {stats.calls:>9} {stats.time:>10.6f} {stats.self_time:>10.6f} "
+                    f"{stats.errors:>7} {stats.discarded:>9}")
+
+        def by_self_time(item: Tuple[Any, ProfileStats]) -> float:
+            return -item[1].self_time
+
+        methods = sorted(self.by_method().items(), key=by_self_time)
+        paths = sorted(self.by_path().items(), key=by_self_time)[:limit]
+        return "\n".join([
+            header,
+            *[row(method, stats) for method, stats in methods],
+            "",
+            header,
+            *[row(format_path(path), stats) for path, stats in paths],
+        ])
@@ -0,0 +1,113 @@
+from collections import OrderedDict
+from hashlib import blake2b, sha256
+from threading import Lock
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Tuple, Type
+
+from district42 import GenericSchema
+from niltype import Nil, Nilable
+
+from ._cache_stats import CacheStats
+from ._plan_cache import PlanCache
+
+__all__ = ("ResultCache",)
+
+_POLICIES = ("lru", "fifo",)
+
+# exact types only, their repr is their content
+_PLAIN_TYPES: FrozenSet[Type[Any]] = frozenset({
+    type(None), bool, int, float, str, bytes, type(...),
+})
+
+
+def _is_plain(value: Any) -> bool:
+    value_type = type(value)
+    if value_type in _PLAIN_TYPES:
+        return True
+    if (value_type is list) or (value_type is tuple):
+        return all(_is_plain(x) for x in value)
+    if value_type is dict:
+        return all(_is_plain(key) and _is_plain(val) for key, val in value.items())
+    return False
+
+
+def _content_hash(value: Any) -> bytes:
+    return blake2b(repr(value).encode(), digest_size=16).digest()
+
+
+class ResultCache:
+    def __init__(self, max_size: int = 1024, policy: str = "lru") -> None:
+        if policy not in _POLICIES:
+            raise ValueError(f"Eviction policy must be one of {_POLICIES}, {policy!r} given")
+        self._max_size = max_size
+        self._policy = policy
+        self._results: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._fingerprints: PlanCache[str] = PlanCache()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def policy(self) -> str:
+        return self._policy
+
+    def fingerprint(self, schema: GenericSchema) -> Optional[str]:
+        # equal schemas have equal reprs, the digest is computed once per schema object
+        fingerprint = self._fingerprints.get(schema)
+        if fingerprint is None:
+            try:
+                representation = repr(schema)
+            except AttributeError:  # custom types without a representor
+                representation = ""
+            fingerprint = sha256(representation.encode()).hexdigest() if representation else ""
+            self._fingerprints.set(schema, fingerprint)
+        return fingerprint or None
+
+    def make_key(self, schema: GenericSchema, value: Any,
+                 options: Dict[str, Any]) -> Optional[Hashable]:
+        # None: the schema or the value can't be hashed by its content,
+        # or the result is lazy and still reads from the value of the first caller
+        if options.get("lazy"):
+            return None
+        fingerprint = self.fingerprint(schema)
+        if (fingerprint is None) or not _is_plain(value):
+            return None
+        items: Tuple[Tuple[str, Any], ...] = tuple(sorted(options.items()))
+        try:
+            hash(items)
+        except TypeError:
+            return None
+        return (fingerprint, _content_hash(value), items)
+
+    def get(self, key: Hashable) -> Nilable[Any]:
+        with self._lock:
+            result = self._results.get(key, Nil)
+            if result is Nil:
+                self._misses += 1
+                return Nil
+            self._hits += 1
+            if self._policy == "lru":
+                self._results.move_to_end(key)
+            return result
+
+    def set(self, key: Hashable, result: Any) -> Any:
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self._max_size:
+                self._results.popitem(last=False)
+        return result
+
+    def stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, len(self._results), self._max_size)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
@@ -1,4 +1,22 @@
-from typing import Any, Dict, List, Optional, cast
+from concurrent.futures import Executor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from itertools import islice
+from threading import local
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
+from weakref import ref
 
 from district42 import SchemaVisitor, from_native
 from district42.types import (
@@ -18,189 +36,983 @@ from district42.types import (
 )
 from district42.utils import is_ellipsis
 from niltype import Nil
-from valera import Formatter, Validator
-
+from th import PathHolder
+from valera import Formatter, ValidationResult, Validator
+from valera.errors import ValidationError
+
+from ._arrays import array_to_list, is_array
+from ._cache_stats import CacheStats
+from ._ellipses import find_ellipses
+from ._interner import Interner, InternStats
+from ._lazy import LazyElements, LazyKeys, is_native, snapshot
+from ._matcher import BodyMatcher
+from ._native_memo import NativeMemo
+from ._parallel import (
+    dict_chunks,
+    extra_key_errors,
+    list_chunks,
+    validate_batch,
+    validate_dict,
+    validate_elements,
+    validate_items,
+    validate_list,
+)
+from ._patch import Patch, element_schema, parse_path
+from ._plan_cache import Plan, PlanCache
+from ._profiler import ROOT, Path, Profiler, visit_name
+from ._type_index import TypeIndex
 from ._validator import SubstitutorValidator
 from .errors import SubstitutionError, make_substitution_error
 
 __all__ = ("Substitutor",)
 
+ValidateFn = Callable[..., None]
+FromNativeFn = Callable[[Any], GenericSchema]
+KeyItems = List[Tuple[Any, Tuple[GenericSchema, bool]]]
+
+
+def _ignore_discarded() -> None:
+    pass
+
+
+class _ProfilingState(local):
+    profiler: Optional[Profiler] = None
+    path: Path = ROOT  # path of the schema being compiled while profiling
+
 
 class Substitutor(SchemaVisitor[GenericSchema]):
     def __init__(self, validator: Optional[Validator] = None,
-                 formatter: Optional[Formatter] = None) -> None:
+                 formatter: Optional[Formatter] = None, *,
+                 fail_fast: bool = False, native_cache_size: int = 1024,
+                 interning: bool = False) -> None:
         self._validator = validator or SubstitutorValidator()
+        # union alternatives matched by the validator aren't validated again (see _compile_any)
+        self._trials = self._validator if isinstance(self._validator,
+                                                     SubstitutorValidator) else None
         self._formatter = formatter or Formatter()
+        self._fail_fast = fail_fast
+        self._plans: PlanCache[Plan] = PlanCache()
+        self._plan_compiler = _PlanCompiler(self)
+        # plans of built-in visit_* that overriding methods fall back to (super().visit_*)
+        self._builtin_plans: PlanCache[Plan] = PlanCache()
+        self._builtin_compiler = _PlanCompiler(self, is_builtin=True)
+        # profile() instruments only the calling thread, plans are shared by all threads
+        self._profiling = _ProfilingState()
+        # schemas of repeated scalars are shared, they are immutable as any other schema
+        self._native_memo = NativeMemo(self._convert_native, native_cache_size)
+        self._interner = Interner() if interning else None
+
+    def compile(self, schema: GenericSchema) -> Plan:
+        plan = self._compile(schema)
+        if self._interner is None:
+            return plan
+        return self._compile_interned(plan, self._interner)
+
+    def _compile(self, schema: GenericSchema) -> Plan:
+        profiler = self._profiling.profiler
+        if profiler is not None:
+            return self._compile_profiled(schema, profiler.current_path())
+        leaf_visit = _LEAF_VISITS.get(type(schema))
+        if (leaf_visit is not None) and not self._is_overridden(leaf_visit):
+            # leaves gain nothing from a compiled plan and are often built for one call
+            # (schema.int % 1), so they are substituted directly and never cached
+            return partial(self._substitute_leaf, schema)
+        plan = self._plans.get(schema)
+        if plan is None:
+            plan = self._plans.set(schema, schema.__accept__(self._plan_compiler))
+        return plan
+
+    @contextmanager
+    def profile(self, profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+        # plans compiled inside are instrumented, cached plans stay as they are
+        profiler = profiler or Profiler()
+        previous, self._profiling.profiler = self._profiling.profiler, profiler
+        validator = self._trials
+        previous_validator = validator.set_profiler(profiler) if validator is not None else None
+        try:
+            yield profiler
+        finally:
+            self._profiling.profiler = previous
+            if validator is not None:
+                validator.set_profiler(previous_validator)
+
+    def _compile_child(self, schema: GenericSchema, *segments: str) -> Plan:
+        if self._profiling.profiler is None:
+            return self._compile(schema)
+        return self._compile_profiled(schema, self._profiling.path + segments)
+
+    def _compile_interned(self, plan: Plan, interner: Interner) -> Plan:
+        # whole results are interned once, lazy ones would be resolved by the walk
+        def interned(value: Any, **kwargs: Any) -> Any:
+            result = plan(value, **kwargs)
+            return result if kwargs.get("lazy") else interner.intern(result)
+        return interned
+
+    def intern_stats(self) -> InternStats:
+        if self._interner is None:
+            return InternStats(0, 0, 0)
+        return self._interner.stats()
+
+    def _compile_profiled(self, schema: GenericSchema, path: Path) -> Plan:
+        state = self._profiling
+        profiler = cast(Profiler, state.profiler)
+        plan = profiler.get_plan(schema, path)
+        if plan is None:
+            previous, state.path = state.path, path
+            try:
+                plan = schema.__accept__(self._plan_compiler)
+            finally:
+                state.path = previous
+            plan = profiler.set_plan(schema, path, profiler.wrap(path, visit_name(schema), plan),
+                                     parent=state.path)
+        return plan
+
+    def _compile_from_native(self) -> FromNativeFn:
+        profiler = self._profiling.profiler
+        if profiler is None:
+            return self._from_native
+        return cast(FromNativeFn, profiler.wrap(self._profiling.path, "from_native",
+                                                self._from_native))
+
+    def _compile_discard(self, schema: GenericSchema) -> Callable[[], None]:
+        # called for every trial substitution thrown away by any/body plans
+        profiler = self._profiling.profiler
+        if profiler is None:
+            return _ignore_discarded
+        return profiler.discard_hook(self._profiling.path, visit_name(schema))
+
+    def _make_error(self, errors: List[ValidationError]) -> SubstitutionError:
+        result = ValidationResult()
+        result.add_errors(errors)
+        return make_substitution_error(result, self._formatter)
+
+    def _substitute_in_pool(self, schema: GenericSchema, value: Any, pool: Executor, *,
+                            chunk_size: int, lazy: bool = False,
+                            fail_fast: Optional[bool] = None, **kwargs: Any) -> Any:
+        # validation runs in any pool: it's the costly half of substitution and returns
+        # a few errors, while substituted schemas cost as much to unpickle as to build,
+        # so only thread pools substitute in parallel as well
+        plan = self.compile(schema)
+        is_large_list = _is_large_list(schema, value, chunk_size)
+        is_wide_dict = _is_wide_dict(schema, value, chunk_size)
+        if not (is_large_list or is_wide_dict):
+            return plan(value, lazy=lazy, fail_fast=fail_fast, **kwargs)
+
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        if is_large_list:
+            errors = validate_list(cast(ListSchema, schema), value, pool, chunk_size, fail_fast)
+        else:
+            errors = validate_dict(cast(DictSchema, schema), value, pool, chunk_size, fail_fast)
+        if len(errors) > 0:
+            raise self._make_error(errors)
+
+        if lazy:
+            return plan(snapshot(value), _validated=True, lazy=True, fail_fast=fail_fast,
+                        **kwargs)
+        if not isinstance(pool, ThreadPoolExecutor):
+            return plan(value, _validated=True, fail_fast=fail_fast, **kwargs)
+        result: GenericSchema
+        if is_large_list:
+            result = self._substitute_list_in_threads(cast(ListSchema, schema), value, pool,
+                                                      chunk_size=chunk_size,
+                                                      fail_fast=fail_fast, **kwargs)
+        else:
+            result = self._substitute_dict_in_threads(cast(DictSchema, schema), value, pool,
+                                                      chunk_size=chunk_size,
+                                                      fail_fast=fail_fast, **kwargs)
+        return result if self._interner is None else self._interner.intern(result)
+
+    def _substitute_list_in_threads(self, schema: ListSchema, value: List[Any],
+                                    pool: ThreadPoolExecutor, *, chunk_size: int,
+                                    **kwargs: Any) -> ListSchema:
+        if find_ellipses(value):
+            return cast(ListSchema, self._compile(schema)(value, _validated=True, **kwargs))
+        futures = [pool.submit(chunk)
+                   for chunk in self._list_chunks(schema, value, chunk_size, **kwargs)]
+        elements = [element for future in futures for element in future.result()]
+        return schema.__class__(schema.props.update(elements=elements, type=Nil))
+
+    def _list_chunks(self, schema: ListSchema, value: List[Any], chunk_size: int,
+                     **kwargs: Any) -> List[Callable[[], List[GenericSchema]]]:
+        # elements of a validated list without ..., substituted chunk by chunk
+        type_plan = self._compile(cast(GenericSchema, schema.props.type))
+
+        def substitute_chunk(start: int) -> List[GenericSchema]:
+            return [type_plan(val, _validated=True, **kwargs)
+                    for val in islice(value, start, start + chunk_size)]
+
+        return [partial(substitute_chunk, start) for start in range(0, len(value), chunk_size)]
+
+    def _substitute_dict_in_threads(self, schema: DictSchema, value: Dict[Any, Any],
+                                    pool: ThreadPoolExecutor, *, chunk_size: int,
+                                    **kwargs: Any) -> DictSchema:
+        if ... in value:
+            return cast(DictSchema, self._compile(schema)(value, _validated=True, **kwargs))
+        futures = [pool.submit(chunk)
+                   for chunk in self._dict_chunks(schema, value, chunk_size, **kwargs)]
+        keys = dict(item for future in futures for item in future.result())
+        return schema.__class__(schema.props.update(keys=keys))
 
-    def _from_native(self, value: Any) -> GenericSchema:
+    def _dict_chunks(self, schema: DictSchema, value: Dict[Any, Any], chunk_size: int,
+                     **kwargs: Any) -> List[Callable[[], KeyItems]]:
+        # keys of a validated dict without ..., substituted chunk by chunk
+        items = list(cast(Dict[Any, Tuple[GenericSchema, bool]], schema.props.keys).items())
+
+        def substitute_chunk(start: int) -> KeyItems:
+            return [(key, (self._compile(val)(value[key], _validated=True, **kwargs), False))
+                    if key in value else (key, (val, is_optional))
+                    for key, (val, is_optional) in islice(items, start, start + chunk_size)]
+
+        return [partial(substitute_chunk, start) for start in range(0, len(items), chunk_size)]
+
+    async def _asubstitute(self, schema: GenericSchema, value: Any, *, yield_every: int,
+                           lazy: bool = False, fail_fast: Optional[bool] = None,
+                           **kwargs: Any) -> Any:
+        # the pool path on the event loop: elements of a large list (keys of a wide dict)
+        # are validated, then substituted, yield_every at a time between loop ticks
+        from asyncio import sleep  # not at module level, it adds ~60ms to import
+
+        plan = self.compile(schema)
+        is_large_list = _is_large_list(schema, value, yield_every)
+        if not (is_large_list or _is_wide_dict(schema, value, yield_every)):
+            return plan(value, lazy=lazy, fail_fast=fail_fast, **kwargs)
+
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        errors: List[ValidationError]
+        if is_large_list:
+            errors, element_chunks = list_chunks(cast(ListSchema, schema), value, yield_every,
+                                                 fail_fast)
+            type_schema = cast(GenericSchema, schema.props.type)
+            for index, chunk in element_chunks:
+                await sleep(0)
+                errors += validate_elements(type_schema, chunk, index, fail_fast)
+                if fail_fast and len(errors) > 0:
+                    break
+        else:
+            errors, item_chunks = dict_chunks(cast(DictSchema, schema), value, yield_every,
+                                              fail_fast)
+            if len(errors) == 0:
+                for items_chunk in item_chunks:
+                    await sleep(0)
+                    errors += validate_items(items_chunk, fail_fast)
+                    if fail_fast and len(errors) > 0:
+                        break
+                if not (fail_fast and len(errors) > 0):
+                    errors += extra_key_errors(cast(DictSchema, schema), value, fail_fast)
+        if len(errors) > 0:
+            raise self._make_error(errors)
+
+        if lazy:
+            return plan(snapshot(value), _validated=True, lazy=True, fail_fast=fail_fast,
+                        **kwargs)
+        result: GenericSchema
+        if is_large_list and not find_ellipses(value):
+            elements: List[GenericSchema] = []
+            for substitute_elements in self._list_chunks(cast(ListSchema, schema), value,
+                                                         yield_every, fail_fast=fail_fast,
+                                                         **kwargs):
+                await sleep(0)
+                elements += substitute_elements()
+            result = schema.__class__(schema.props.update(elements=elements, type=Nil))
+        elif not is_large_list and (... not in value):
+            keys: Dict[Any, Tuple[GenericSchema, bool]] = {}
+            for substitute_keys in self._dict_chunks(cast(DictSchema, schema), value,
+                                                     yield_every, fail_fast=fail_fast,
+                                                     **kwargs):
+                await sleep(0)
+                keys.update(substitute_keys())
+            result = schema.__class__(schema.props.update(keys=keys))
+        else:
+            return plan(value, _validated=True, fail_fast=fail_fast, **kwargs)
+        return result if self._interner is None else self._interner.intern(result)
+
+    def _substitute_many_in_pool(self, schema: GenericSchema, values: Iterable[Any],
+                                 pool: Executor, *, chunk_size: int,
+                                 fail_fast: Optional[bool] = None,
+                                 **kwargs: Any) -> List[Union[GenericSchema, SubstitutionError]]:
+        plan = self.compile(schema)
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        values = list(values)
+        batch_errors = validate_batch(schema, values, pool, chunk_size, fail_fast)
+
+        results: List[Union[GenericSchema, SubstitutionError]] = []
+        for value, errors in zip(values, batch_errors):
+            if len(errors) > 0:
+                results.append(self._make_error(errors))
+                continue
+            try:
+                results.append(plan(value, _validated=True, fail_fast=fail_fast, **kwargs))
+            except SubstitutionError as e:
+                results.append(e)
+        return results
+
+    def resubstitute(self, result: GenericSchema, schema: GenericSchema, patch: Patch, *,
+                     fail_fast: Optional[bool] = None, **kwargs: Any) -> GenericSchema:
+        # only schemas along the patched paths are substituted again, the rest is shared
+        kwargs.pop("_validated", None)
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        for path, value in patch:
+            result = self._patch(result, schema, parse_path(path), PathHolder(), value,
+                                 fail_fast=fail_fast, **kwargs)
+        return result
+
+    def _patch(self, result: Optional[GenericSchema], schema: Optional[GenericSchema],
+               keys: Tuple[Any, ...], path: PathHolder, value: Any, *,
+               fail_fast: bool, **kwargs: Any) -> GenericSchema:
+        # schema is None where the previous result was converted by from_native
+        if len(keys) == 0:
+            if schema is None:
+                return self._from_native(value)
+            res = schema.__accept__(self._validator, value=value, path=path, fail_fast=fail_fast)
+            if res.has_errors():
+                raise make_substitution_error(res, self._formatter)
+            return cast(GenericSchema, self.compile(schema)(value, _validated=True,
+                                                            fail_fast=fail_fast, **kwargs))
+
+        if isinstance(result, GenericTypeAliasSchema) and isinstance(schema,
+                                                                     GenericTypeAliasSchema):
+            patched = self._patch(result.props.type, schema.props.type, keys, path, value,
+                                  fail_fast=fail_fast, **kwargs)
+            return result.__class__(result.props.update(type=patched))
+        if isinstance(result, DictSchema) and (schema is None or isinstance(schema, DictSchema)):
+            return self._patch_dict(result, schema, keys, path, value,
+                                    fail_fast=fail_fast, **kwargs)
+        if isinstance(result, ListSchema) and (schema is None or isinstance(schema, ListSchema)):
+            return self._patch_list(result, schema, keys, path, value,
+                                    fail_fast=fail_fast, **kwargs)
+        raise SubstitutionError(f"Can't patch {keys[0]!r} of {result!r}")
+
+    def _patch_dict(self, result: DictSchema, schema: Optional[DictSchema],
+                    keys: Tuple[Any, ...], path: PathHolder, value: Any,
+                    **kwargs: Any) -> DictSchema:
+        key, rest = keys[0], keys[1:]
+        result_keys = {} if result.props.keys is Nil else dict(result.props.keys)
+
+        child_schema: Optional[GenericSchema] = None
+        if (schema is not None) and (schema.props.keys is not Nil) and not (
+                len(schema.props.keys) == 1 and ... in schema.props.keys):
+            if is_ellipsis(key) or (key not in schema.props.keys):
+                raise SubstitutionError(f"Unknown key {key!r}")
+            child_schema, _ = schema.props.keys[key]
+
+        entry = result_keys.get(key)
+        if (entry is None) and (len(rest) > 0):
+            raise SubstitutionError(f"Can't patch key {key!r}: it's not substituted")
+        patched = self._patch(None if entry is None else entry[0], child_schema, rest,
+                              path[key], value, **kwargs)
+
+        if (entry is None) and (... in result_keys):
+            # new keys of relaxed dicts go before ...
+            relaxed = result_keys.pop(...)
+            result_keys[key] = (patched, False)
+            result_keys[...] = relaxed
+        else:
+            result_keys[key] = (patched, False)
+        return result.__class__(result.props.update(keys=result_keys))
+
+    def _patch_list(self, result: ListSchema, schema: Optional[ListSchema],
+                    keys: Tuple[Any, ...], path: PathHolder, value: Any,
+                    **kwargs: Any) -> ListSchema:
+        key, rest = keys[0], keys[1:]
+        if result.props.elements is Nil:
+            raise SubstitutionError(f"Can't patch index {key!r}: elements aren't substituted")
+        elements: List[Any] = list(result.props.elements)
         try:
-            return from_native(value)
+            index = int(key)
         except ValueError:
-            raise SubstitutionError(f"Can't convert {value!r} to schema")
+            raise SubstitutionError(f"Can't patch key {key!r} of a list")
+        if not (0 <= index < len(elements)):
+            raise SubstitutionError(f"Index {index} out of range")
+        if elements[index] is ...:
+            raise SubstitutionError("Can't substitute ...")
 
-    def visit_none(self, schema: NoneSchema, *, value: Any = Nil, **kwargs: Any) -> NoneSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props)
+        child_schema = None if schema is None else element_schema(schema, len(elements), index)
+        elements[index] = self._patch(elements[index], child_schema, rest, path[index], value,
+                                      **kwargs)
+        return result.__class__(result.props.update(elements=elements))
 
-    def visit_bool(self, schema: BoolSchema, *, value: Any = Nil, **kwargs: Any) -> BoolSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+    def native_cache_stats(self) -> CacheStats:
+        return self._native_memo.stats()
 
-    def visit_int(self, schema: IntSchema, *, value: Any = Nil, **kwargs: Any) -> IntSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+    def _from_native(self, value: Any) -> GenericSchema:
+        return self._native_memo(value)
 
-    def visit_float(self, schema: FloatSchema, *, value: Any = Nil, **kwargs: Any) -> FloatSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+    def _convert_native(self, value: Any) -> GenericSchema:
+        try:
+            return from_native(value)
+        except ValueError:
+            raise SubstitutionError(f"Can't convert {value!r} to schema")
 
-    def visit_str(self, schema: StrSchema, *, value: Any = Nil, **kwargs: Any) -> StrSchema:
-        result = schema.__accept__(self._validator, value=value)
+    def _check_native(self, values: Iterable[Any]) -> None:
+        # lazy nodes convert on access, but fail up front as eager substitution does
+        for val in values:
+            if not is_native(val):
+                raise SubstitutionError(f"Can't convert {val!r} to schema")
+
+    def _validate(self, schema: GenericSchema, value: Any, fail_fast: Optional[bool]) -> None:
+        trials = self._trials
+        if (trials is not None) and trials.is_matched(schema, value):
+            return
+        if fail_fast is None:
+            fail_fast = self._fail_fast
+        result = schema.__accept__(self._validator, value=value, fail_fast=fail_fast)
         if result.has_errors():
             raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+
+    def _substitute_leaf(self, schema: GenericSchema, value: Any, *, _validated: bool = False,
+                         share: bool = False, fail_fast: Optional[bool] = None,
+                         **kwargs: Any) -> GenericSchema:
+        # the plan of _compile_value and _compile_none, without compiling
+        if not _validated:
+            self._validate(schema, value, fail_fast)
+        props = schema.props
+        if isinstance(schema, NoneSchema):
+            return schema if share else schema.__class__(props)
+        if share:
+            current = props.get("value")
+            if value is current or (type(value) is type(current) and value == current):
+                return schema
+        return schema.__class__(props.update(value=value))
+
+    def _compile_validate(self, schema: GenericSchema) -> ValidateFn:
+        # plans are cached per schema and must not keep their schema alive
+        detached = schema.__class__(schema.props)
+
+        def validate(value: Any, _validated: bool = False, fail_fast: Optional[bool] = None,
+                     **kwargs: Any) -> None:
+            if not _validated:
+                self._validate(detached, value, fail_fast)
+
+        profiler = self._profiling.profiler
+        if profiler is None:
+            return validate
+        profiled = profiler.wrap(self._profiling.path, "validate", validate)
+        trials = self._trials
+
+        def profiled_validate(value: Any, _validated: bool = False, **kwargs: Any) -> None:
+            # matched alternatives were validated in the frame of the union (see _accept_nested)
+            if not (_validated or ((trials is not None) and trials.is_matched(detached, value))):
+                profiled(value, **kwargs)
+
+        return profiled_validate
+
+    def _compile_original(self, schema: GenericSchema) -> Callable[[], GenericSchema]:
+        # share=True returns untouched schemas as they are, the plan holds them weakly
+        # (see _compile_validate), a detached copy sharing the props is the fallback
+        schema_ref = ref(schema)
+        detached = schema.__class__(schema.props)
+
+        def original() -> GenericSchema:
+            schema = schema_ref()
+            return detached if schema is None else schema
+
+        return original
+
+    def _compile_value(self, schema: GenericSchema) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        validate = self._compile_validate(schema)
+        original = self._compile_original(schema)
+        current = props.get("value")
+
+        def plan(value: Any, *, _validated: bool = False, share: bool = False,
+                 **kwargs: Any) -> GenericSchema:
+            validate(value, _validated, **kwargs)
+            if share and (value is current
+                          or (type(value) is type(current) and value == current)):
+                return original()
+            return schema_type(props.update(value=value))
+
+        return plan
+
+    def _compile_none(self, schema: NoneSchema) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        validate = self._compile_validate(schema)
+        original = self._compile_original(schema)
+
+        def plan(value: Any, *, _validated: bool = False, share: bool = False,
+                 **kwargs: Any) -> NoneSchema:
+            validate(value, _validated, **kwargs)
+            if share:
+                return cast(NoneSchema, original())
+            return schema_type(props)
+
+        return plan
 
     def _substitute_elements(self,
                              value: List[Any],
-                             elements: List[GenericSchema],
-                             start: int = 0,
+                             elements: List[Plan],
+                             start: int = 0, *,
+                             from_native: FromNativeFn,
+                             lazy: bool = False,
+                             trial: bool = False,
                              **kwargs: Any) -> List[GenericSchema]:
+        # trials are substituted eagerly, lazy elements would defer their failures
+        is_lazy_element = lazy and not trial
         substituted = []
-        for index, element_schema in enumerate(elements):
+        for index, element_plan in enumerate(elements):
             real_index = start + index
             if real_index >= len(value):
                 raise SubstitutionError(f"Index {real_index} out of range")
-            res = element_schema.__accept__(self, value=value[real_index], **kwargs)
+            res = element_plan(value[real_index], lazy=is_lazy_element, **kwargs)
             substituted.append(res)
 
-        for i in range(start + len(substituted), len(value)):
-            substituted.insert(i, self._from_native(value[i]))
-
-        for i in range(start):
-            substituted.insert(i, self._from_native(value[i]))
-
-        return substituted
-
-    def visit_list(self, schema: ListSchema, *, value: Any = Nil, **kwargs: Any) -> ListSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-
-        if len(value) > 0 and all(is_ellipsis(x) for x in value):
-            raise SubstitutionError("Can't substitute all ...")
-
-        if (schema.props.elements is Nil) and (schema.props.type is Nil):
-            elements = []
-            for val in value:
-                element = val if is_ellipsis(val) else self._from_native(val)
-                elements.append(element)
-            return schema.__class__(schema.props.update(elements=elements))
-
-        if schema.props.type is not Nil:
-            elements = []
-            for val in value:
-                if is_ellipsis(val):
-                    element = val
+        if lazy:
+            self._check_native(islice(value, start))
+            self._check_native(islice(value, start + len(substituted), None))
+            resolved = {start + index: res for index, res in enumerate(substituted)}
+            return cast(List[GenericSchema], LazyElements(value, from_native, resolved))
+
+        end = start + len(substituted)
+        return [
+            *map(from_native, islice(value, start)),
+            *substituted,
+            *map(from_native, islice(value, end, None)),
+        ]
+
+    def _compile_list(self, schema: ListSchema) -> Plan:
+        validate = self._compile_validate(schema)
+        list_plan = self._compile_list_elements(schema, validate)
+
+        def plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> ListSchema:
+            if is_array(value):
+                # typed numeric arrays are validated as a whole (see SubstitutorValidator)
+                validate(value, _validated, **kwargs)
+                value, _validated = array_to_list(value), True
+            return cast(ListSchema, list_plan(value, _validated=_validated, **kwargs))
+
+        return plan
+
+    def _compile_list_elements(self, schema: ListSchema, validate: ValidateFn) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        from_native = self._compile_from_native()
+
+        def prepare(value: Any, _validated: bool, **kwargs: Any) -> FrozenSet[int]:
+            validate(value, _validated, **kwargs)
+            # the only pass over the value before the elements are substituted
+            ellipses = find_ellipses(value)
+            if len(value) > 0 and len(ellipses) == len(value):
+                raise SubstitutionError("Can't substitute all ...")
+            return ellipses
+
+        if (props.elements is Nil) and (props.type is Nil):
+            def untyped_plan(value: Any, *, _validated: bool = False, lazy: bool = False,
+                             **kwargs: Any) -> ListSchema:
+                ellipses = prepare(value, _validated, **kwargs)
+                if lazy:
+                    self._check_native(val for index, val in enumerate(value)
+                                       if index not in ellipses)
+                    if not _validated:
+                        value = snapshot(value)
+                    resolved = dict.fromkeys(ellipses, ...)
+                    lazy_elements = LazyElements(value, from_native, resolved)
+                    return schema_type(props.update(elements=lazy_elements))
+                if not ellipses:
+                    elements = [from_native(val) for val in value]
                 else:
-                    element = schema.props.type.__accept__(self, value=val, **kwargs)
-                elements.append(element)
-            return schema.__class__(schema.props.update(elements=elements, type=Nil))
+                    elements = [val if index in ellipses else from_native(val)
+                                for index, val in enumerate(value)]
+                return schema_type(props.update(elements=elements))
+            return untyped_plan
+
+        if props.type is not Nil:
+            type_plan = self._compile_child(props.type, "[*]")
+
+            def typed_plan(value: Any, *, _validated: bool = False, lazy: bool = False,
+                           **kwargs: Any) -> ListSchema:
+                ellipses = prepare(value, _validated, **kwargs)
+                if lazy:
+                    if not _validated:
+                        value = snapshot(value)
+
+                    def convert(val: Any) -> Any:
+                        return type_plan(val, _validated=True, lazy=True, **kwargs)
+                    lazy_elements = LazyElements(value, convert, dict.fromkeys(ellipses, ...))
+                    return schema_type(props.update(elements=lazy_elements, type=Nil))
+                if not ellipses:
+                    elements = [type_plan(val, _validated=True, **kwargs) for val in value]
+                else:
+                    elements = [val if index in ellipses
+                                else type_plan(val, _validated=True, **kwargs)
+                                for index, val in enumerate(value)]
+                return schema_type(props.update(elements=elements, type=Nil))
+            return typed_plan
 
-        elements = cast(List[GenericSchema], schema.props.elements)
-        if ... in value:
-            raise SubstitutionError("Can't substitute ...")
+        elements = cast(List[GenericSchema], props.elements)
+
+        def prepare_elements(value: Any, _validated: bool, *, lazy: bool = False,
+                             **kwargs: Any) -> Any:
+            if prepare(value, _validated, **kwargs):
+                raise SubstitutionError("Can't substitute ...")
+            # the value lazy elements are converted from later (see snapshot)
+            return snapshot(value) if (lazy and not _validated) else value
 
         # body
         if (len(elements) > 2) and is_ellipsis(elements[0]) and is_ellipsis(elements[-1]):
-            for index, val in enumerate(value):
-                try:
-                    substituted = self._substitute_elements(value, elements[1:-1], index, **kwargs)
-                except SubstitutionError:
-                    pass
-                else:
-                    return schema.__class__(schema.props.update(elements=substituted))
+            body = [self._compile_child(x, f"[*+{i}]" if i else "[*]")
+                    for i, x in enumerate(elements[1:-1])]
+            matcher = BodyMatcher(elements[1:-1])
+            discard = self._compile_discard(schema)
+
+            def body_plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> ListSchema:
+                value = prepare_elements(value, _validated, **kwargs)
+                # list validation doesn't tell which position matches,
+                # so elements validate themselves (failed positions are discarded)
+                trial_kwargs = {**kwargs, "fail_fast": True}
+                for index in matcher.candidates(value):
+                    try:
+                        substituted = self._substitute_elements(value, body, index,
+                                                                from_native=from_native,
+                                                                trial=True, **trial_kwargs)
+                    except SubstitutionError:
+                        discard()
+                    else:
+                        return schema_type(props.update(elements=substituted))
+                raise SubstitutionError("Can't substitute elements")
+            return body_plan
 
         # head
         if (len(elements) >= 2) and is_ellipsis(elements[-1]):
-            substituted = self._substitute_elements(value, elements[:-1], **kwargs)
-            return schema.__class__(schema.props.update(elements=substituted))
+            head = [self._compile_child(x, f"[{i}]") for i, x in enumerate(elements[:-1])]
+
+            def head_plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> ListSchema:
+                value = prepare_elements(value, _validated, **kwargs)
+                substituted = self._substitute_elements(value, head, from_native=from_native,
+                                                        _validated=True, **kwargs)
+                return schema_type(props.update(elements=substituted))
+            return head_plan
 
         # tail
         if (len(elements) >= 1) and is_ellipsis(elements[0]):
-            elements = elements[1:]
-            index = max(0, len(value) - len(elements))
-            substituted = self._substitute_elements(value, elements, index, **kwargs)
-            return schema.__class__(schema.props.update(elements=substituted))
+            tail = [self._compile_child(x, f"[{i - len(elements) + 1}]")
+                    for i, x in enumerate(elements[1:])]
+
+            def tail_plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> ListSchema:
+                value = prepare_elements(value, _validated, **kwargs)
+                index = max(0, len(value) - len(tail))
+                substituted = self._substitute_elements(value, tail, index,
+                                                        from_native=from_native,
+                                                        _validated=True, **kwargs)
+                return schema_type(props.update(elements=substituted))
+            return tail_plan
+
+        exact = [self._compile_child(x, f"[{i}]") for i, x in enumerate(elements)]
+        original = self._compile_original(schema)
+
+        def plan(value: Any, *, _validated: bool = False, share: bool = False,
+                 **kwargs: Any) -> ListSchema:
+            value = prepare_elements(value, _validated, **kwargs)
+            substituted = self._substitute_elements(value, exact, from_native=from_native,
+                                                    _validated=True, share=share, **kwargs)
+            if share and (len(substituted) == len(elements)) and all(
+                    x is y for x, y in zip(substituted, elements)):
+                return cast(ListSchema, original())
+            return schema_type(props.update(elements=substituted))
+
+        return plan
+
+    def _compile_dict(self, schema: DictSchema) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        validate = self._compile_validate(schema)
+
+        def prepare(value: Any, _validated: bool, **kwargs: Any) -> None:
+            validate(value, _validated, **kwargs)
+            if ... in value:
+                raise SubstitutionError("Can't substitute ...")
+
+        if props.keys is Nil or (len(props.keys) == 1 and ... in props.keys):
+            is_relaxed = props.keys is not Nil
+            from_native = self._compile_from_native()
+
+            def convert_native(key: Any, val: Any) -> Tuple[GenericSchema, bool]:
+                return (from_native(val), False)
+
+            def relaxed_plan(value: Any, *, _validated: bool = False, lazy: bool = False,
+                             **kwargs: Any) -> DictSchema:
+                prepare(value, _validated, **kwargs)
+                if lazy:
+                    self._check_native(value.values())
+                    if not _validated:
+                        value = snapshot(value)
+                    order = [*value, ...] if is_relaxed else value
+                    resolved = {...: (..., False)} if is_relaxed else None
+                    lazy_keys = LazyKeys(order, value, convert_native, resolved)
+                    return schema_type(props.update(keys=lazy_keys))
+                keys: Dict[Any, Any] = {}
+                for key, val in value.items():
+                    keys[key] = (from_native(val), False)
+                if is_relaxed:
+                    keys[...] = (..., False)
+                return schema_type(props.update(keys=keys))
+            return relaxed_plan
+
+        known_keys = props.keys
+        key_plans: List[Tuple[Any, GenericSchema, bool, Optional[Plan]]] = [
+            (key, val, is_optional,
+             None if is_ellipsis(key) else self._compile_child(val, str(key)))
+            for key, (val, is_optional) in known_keys.items()
+        ]
+        plans = {key: key_plan for key, _, _, key_plan in key_plans if key_plan is not None}
+        original = self._compile_original(schema)
+
+        def plan(value: Any, *, _validated: bool = False, lazy: bool = False,
+                 share: bool = False, **kwargs: Any) -> DictSchema:
+            prepare(value, _validated, **kwargs)
+            if lazy:
+                return lazy_plan(value if _validated else snapshot(value), **kwargs)
+            keys: Dict[Any, Any] = {}
+            is_changed = False
+            for key, val, is_optional, key_plan in key_plans:
+                if key_plan is not None and key in value:
+                    substituted = key_plan(value[key], _validated=True, share=share, **kwargs)
+                    keys[key] = (substituted, False)
+                    is_changed = is_changed or is_optional or (substituted is not val)
+                else:
+                    keys[key] = known_keys[key]
+            for key in value:
+                if key not in known_keys:
+                    raise SubstitutionError(f"Unknown key {key!r}")
+            if share and not is_changed:
+                return cast(DictSchema, original())
+            return schema_type(props.update(keys=keys))
+
+        def lazy_plan(value: Any, **kwargs: Any) -> DictSchema:
+            def convert(key: Any, val: Any) -> Tuple[GenericSchema, bool]:
+                return (plans[key](val, _validated=True, lazy=True, **kwargs), False)
+
+            resolved: Dict[Any, Any] = {}
+            for key, val, is_optional, key_plan in key_plans:
+                if key_plan is None or key not in value:
+                    resolved[key] = (val, is_optional)
+            for key in value:
+                if key not in known_keys:
+                    raise SubstitutionError(f"Unknown key {key!r}")
+            return schema_type(props.update(keys=LazyKeys(known_keys, value, convert, resolved)))
 
-        substituted = self._substitute_elements(value, elements, **kwargs)
-        return schema.__class__(schema.props.update(elements=substituted))
+        return plan
 
-    def visit_dict(self, schema: DictSchema, *, value: Any = Nil, **kwargs: Any) -> DictSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
+    def _compile_any(self, schema: AnySchema) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        validate = self._compile_validate(schema)
 
-        if ... in value:
-            raise SubstitutionError("Can't substitute ...")
+        if props.types is Nil:
+            from_native = self._compile_from_native()
 
-        keys: Dict[Any, Any] = {}
-        if schema.props.keys is Nil or (len(schema.props.keys) == 1 and ... in schema.props.keys):
-            for key, val in value.items():
-                keys[key] = (self._from_native(val), False)
-            if (schema.props.keys is not Nil) and (... in schema.props.keys):
-                keys[...] = (..., False)
-        else:
-            for key, (val, is_optional) in schema.props.keys.items():
-                if key in value:
-                    keys[key] = (val.__accept__(self, value=value[key], **kwargs), False)
-                else:
-                    keys[key] = (val, is_optional)
-            for key, val in value.items():
-                if key not in schema.props.keys:
-                    raise SubstitutionError(f"Unknown key {key!r}")
+            def untyped_plan(value: Any, **kwargs: Any) -> AnySchema:
+                return schema_type(props.update(types=(from_native(value),)))
+            return untyped_plan
 
-        return schema.__class__(schema.props.update(keys=keys))
+        alternatives = [self._compile_child(x, f"<{i}>") for i, x in enumerate(props.types)]
+        type_index = TypeIndex(props.types)
+        discard = self._compile_discard(schema)
 
-    def visit_any(self, schema: AnySchema, *, value: Any = Nil, **kwargs: Any) -> AnySchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-
-        types = []
-        if schema.props.types is Nil:
-            types.append(self._from_native(value))
-        else:
-            for sch_type in schema.props.types:
+        def plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> AnySchema:
+            # every alternative validates itself (unless matched already, see _compile_trials),
+            # so the union is validated only to report a mismatch;
+            # trials are eager, lazy ones would defer their failures
+            trial_kwargs = {**kwargs, "fail_fast": True, "lazy": False}
+            types = []
+            for position in type_index.lookup(value):
                 try:
-                    substituted = sch_type.__accept__(self, value=value, **kwargs)
+                    substituted = alternatives[position](value, **trial_kwargs)
                 except SubstitutionError:
-                    pass
+                    discard()
                 else:
                     types.append(substituted)
-        return schema.__class__(schema.props.update(types=tuple(types)))
+            if len(types) == 0:
+                validate(value, _validated, **kwargs)
+            return schema_type(props.update(types=tuple(types)))
+
+        return plan
+
+    def _compile_trials(self, schema: GenericSchema, plan: Plan) -> Plan:
+        # alternatives matched while the outermost plan validates aren't validated again
+        # by union trials, so matches are kept until that plan is done (see _compile_any)
+        trials = self._trials
+        if (trials is None) or not _has_union(schema):
+            return plan
+
+        def trials_plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> Any:
+            if _validated or not trials.begin_trials():
+                return plan(value, _validated=_validated, **kwargs)
+            try:
+                return plan(value, **kwargs)
+            finally:
+                trials.end_trials()
+
+        return trials_plan
+
+    def _compile_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType]) -> Plan:
+        schema_type, props = schema.__class__, schema.props
+        type_plan = self._compile_child(props.type)
+        original = self._compile_original(schema)
+
+        def plan(value: Any, *, share: bool = False,
+                 **kwargs: Any) -> GenericTypeAliasSchema[TypeAliasPropsType]:
+            substituted = type_plan(value, share=share, **kwargs)
+            if share and (substituted is props.type):
+                return cast(GenericTypeAliasSchema[TypeAliasPropsType], original())
+            return schema_type(props.update(type=substituted))
+
+        return plan
+
+    def _is_overridden(self, visit_name: str) -> bool:
+        # by a subclass or an extension (extend=True replaces methods of this class)
+        return getattr(type(self), visit_name) is not _BUILTIN_VISITS[visit_name]
+
+    def _compile_builtin(self, schema: GenericSchema, visit_name: str) -> Plan:
+        if not self._is_overridden(visit_name):
+            return self.compile(schema)
+        plan = self._builtin_plans.get(schema)
+        if plan is None:
+            plan = self._builtin_plans.set(schema, schema.__accept__(self._builtin_compiler))
+        return plan
+
+    def _visit(self, schema: GenericSchema, visit_name: str, value: Any,
+               kwargs: Dict[str, Any]) -> Any:
+        # visit_* methods are entry points: overrides may pass on a value of their own
+        # with the kwargs they got, so the flag of the calling plan is dropped
+        kwargs.pop("_validated", None)
+        return self._compile_builtin(schema, visit_name)(value, **kwargs)
+
+    def _compile_accept(self, schema: GenericSchema) -> Plan:
+        detached = schema.__class__(schema.props)
+
+        def plan(value: Any, *, _validated: bool = False, **kwargs: Any) -> Any:
+            return detached.__accept__(self, value=value, **kwargs)
+
+        return plan
+
+    def visit_none(self, schema: NoneSchema, *, value: Any = Nil, **kwargs: Any) -> NoneSchema:
+        return cast(NoneSchema, self._visit(schema, "visit_none", value, kwargs))
+
+    def visit_bool(self, schema: BoolSchema, *, value: Any = Nil, **kwargs: Any) -> BoolSchema:
+        return cast(BoolSchema, self._visit(schema, "visit_bool", value, kwargs))
+
+    def visit_int(self, schema: IntSchema, *, value: Any = Nil, **kwargs: Any) -> IntSchema:
+        return cast(IntSchema, self._visit(schema, "visit_int", value, kwargs))
+
+    def visit_float(self, schema: FloatSchema, *, value: Any = Nil, **kwargs: Any) -> FloatSchema:
+        return cast(FloatSchema, self._visit(schema, "visit_float", value, kwargs))
+
+    def visit_str(self, schema: StrSchema, *, value: Any = Nil, **kwargs: Any) -> StrSchema:
+        return cast(StrSchema, self._visit(schema, "visit_str", value, kwargs))
+
+    def visit_list(self, schema: ListSchema, *, value: Any = Nil, **kwargs: Any) -> ListSchema:
+        return cast(ListSchema, self._visit(schema, "visit_list", value, kwargs))
+
+    def visit_dict(self, schema: DictSchema, *, value: Any = Nil, **kwargs: Any) -> DictSchema:
+        return cast(DictSchema, self._visit(schema, "visit_dict", value, kwargs))
+
+    def visit_any(self, schema: AnySchema, *, value: Any = Nil, **kwargs: Any) -> AnySchema:
+        return cast(AnySchema, self._visit(schema, "visit_any", value, kwargs))
 
     def visit_const(self, schema: ConstSchema, *, value: Any = Nil, **kwargs: Any) -> Any:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+        return self._visit(schema, "visit_const", value, kwargs)
 
     def visit_bytes(self, schema: BytesSchema, *, value: Any = Nil, **kwargs: Any) -> BytesSchema:
-        result = schema.__accept__(self._validator, value=value)
-        if result.has_errors():
-            raise make_substitution_error(result, self._formatter)
-        return schema.__class__(schema.props.update(value=value))
+        return cast(BytesSchema, self._visit(schema, "visit_bytes", value, kwargs))
 
     def visit_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType], *,
                          value: Any = Nil,
                          **kwargs: Any) -> GenericTypeAliasSchema[TypeAliasPropsType]:
-        substituted = schema.props.type.__accept__(self, value=value, **kwargs)
-        return schema.__class__(schema.props.update(type=substituted))
+        return cast(GenericTypeAliasSchema[TypeAliasPropsType],
+                    self._visit(schema, "visit_type_alias", value, kwargs))
+
+
+_BUILTIN_VISITS = {name: fn for name, fn in vars(Substitutor).items()
+                   if name.startswith("visit_")}
+_LEAF_VISITS = {
+    NoneSchema: "visit_none",
+    BoolSchema: "visit_bool",
+    IntSchema: "visit_int",
+    FloatSchema: "visit_float",
+    StrSchema: "visit_str",
+    BytesSchema: "visit_bytes",
+    ConstSchema: "visit_const",
+}
+
+
+def _is_large_list(schema: GenericSchema, value: Any, chunk_size: int) -> bool:
+    return (isinstance(schema, ListSchema) and (schema.props.type is not Nil)
+            and isinstance(value, list) and (len(value) > chunk_size))
+
+
+def _is_wide_dict(schema: GenericSchema, value: Any, chunk_size: int) -> bool:
+    return (isinstance(schema, DictSchema) and (schema.props.keys is not Nil)
+            and (... not in schema.props.keys) and isinstance(value, dict)
+            and (len(schema.props.keys) > chunk_size))
+
+
+def _has_union(schema: GenericSchema) -> bool:
+    props = schema.props
+    if isinstance(schema, AnySchema):
+        return props.types is not Nil
+    if isinstance(schema, GenericTypeAliasSchema):
+        return _has_union(props.type)
+    if isinstance(schema, ListSchema):
+        if props.type is not Nil:
+            return _has_union(props.type)
+        return (props.elements is not Nil) and any(
+            _has_union(x) for x in props.elements if not is_ellipsis(x))
+    if isinstance(schema, DictSchema):
+        return (props.keys is not Nil) and any(
+            _has_union(x) for x, _ in props.keys.values() if not is_ellipsis(x))
+    return False
+
+
+class _PlanCompiler(SchemaVisitor[Plan]):
+    def __init__(self, substitutor: Substitutor, *, is_builtin: bool = False) -> None:
+        self._substitutor = substitutor
+        # nested schemas are compiled by the main compiler, so only the root is built-in
+        self._is_builtin = is_builtin
+
+    def _compile(self, schema: GenericSchema, visit_name: str,
+                 compile_plan: Callable[[Any], Plan]) -> Plan:
+        # overridden visit_* methods are called for every node, not only for the root
+        if not self._is_builtin and self._substitutor._is_overridden(visit_name):
+            return self._substitutor._compile_accept(schema)
+        return self._substitutor._compile_trials(schema, compile_plan(schema))
+
+    def visit_none(self, schema: NoneSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_none", self._substitutor._compile_none)
+
+    def visit_bool(self, schema: BoolSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_bool", self._substitutor._compile_value)
+
+    def visit_int(self, schema: IntSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_int", self._substitutor._compile_value)
+
+    def visit_float(self, schema: FloatSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_float", self._substitutor._compile_value)
+
+    def visit_str(self, schema: StrSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_str", self._substitutor._compile_value)
+
+    def visit_list(self, schema: ListSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_list", self._substitutor._compile_list)
+
+    def visit_dict(self, schema: DictSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_dict", self._substitutor._compile_dict)
+
+    def visit_any(self, schema: AnySchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_any", self._substitutor._compile_any)
+
+    def visit_const(self, schema: ConstSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_const", self._substitutor._compile_value)
+
+    def visit_bytes(self, schema: BytesSchema, **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_bytes", self._substitutor._compile_value)
+
+    def visit_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType],
+                         **kwargs: Any) -> Plan:
+        return self._compile(schema, "visit_type_alias", self._substitutor._compile_type_alias)
+
+    def __getattr__(self, name: Any) -> Any:
+        # custom types (see README) are substituted by their visitor
+        if isinstance(name, str) and name.startswith("visit_"):
+            return lambda schema, **kwargs: self._substitutor._compile_accept(schema)
+        return super().__getattr__(name)
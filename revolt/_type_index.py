@@ -0,0 +1,124 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+from district42 import GenericSchema, SchemaVisitor
+from district42.types import (
+    AnySchema,
+    BoolSchema,
+    BytesSchema,
+    ConstSchema,
+    DictSchema,
+    FloatSchema,
+    GenericTypeAliasSchema,
+    IntSchema,
+    ListSchema,
+    NoneSchema,
+    StrSchema,
+    TypeAliasPropsType,
+)
+from niltype import Nil
+
+from ._arrays import is_array
+
+__all__ = ("TypeIndex",)
+
+# None stands for "any type"
+AcceptedTypes = Optional[Tuple[Type[Any], ...]]
+
+
+class _AcceptedTypes(SchemaVisitor[AcceptedTypes]):
+    def visit_none(self, schema: NoneSchema, **kwargs: Any) -> AcceptedTypes:
+        return (type(None),)
+
+    def visit_bool(self, schema: BoolSchema, **kwargs: Any) -> AcceptedTypes:
+        return (bool,)
+
+    def visit_int(self, schema: IntSchema, **kwargs: Any) -> AcceptedTypes:
+        return (int,)
+
+    def visit_float(self, schema: FloatSchema, **kwargs: Any) -> AcceptedTypes:
+        return (float,)
+
+    def visit_str(self, schema: StrSchema, **kwargs: Any) -> AcceptedTypes:
+        return (str,)
+
+    def visit_bytes(self, schema: BytesSchema, **kwargs: Any) -> AcceptedTypes:
+        return (bytes,)
+
+    def visit_list(self, schema: ListSchema, **kwargs: Any) -> AcceptedTypes:
+        return (list,)
+
+    def visit_dict(self, schema: DictSchema, **kwargs: Any) -> AcceptedTypes:
+        return (dict,)
+
+    def visit_any(self, schema: AnySchema, **kwargs: Any) -> AcceptedTypes:
+        if schema.props.types is Nil:
+            return None
+        accepted: Tuple[Type[Any], ...] = ()
+        for sch_type in schema.props.types:
+            types = sch_type.__accept__(self)
+            if types is None:
+                return None
+            accepted += types
+        return accepted
+
+    def visit_const(self, schema: ConstSchema, **kwargs: Any) -> AcceptedTypes:
+        return None
+
+    def visit_type_alias(self, schema: GenericTypeAliasSchema[TypeAliasPropsType],
+                         **kwargs: Any) -> AcceptedTypes:
+        return schema.props.type.__accept__(self)
+
+    def __getattr__(self, name: Any) -> Any:
+        if isinstance(name, str) and name.startswith("visit_"):
+            return lambda schema, **kwargs: None
+        return super().__getattr__(name)
+
+
+_PINNED_TYPES = (BoolSchema, IntSchema, StrSchema, BytesSchema, ConstSchema)
+
+
+def _make_value_index(alternatives: Sequence[GenericSchema]) -> Optional[Dict[Any, List[int]]]:
+    # unions of value-pinned alternatives (enums) are resolved with one hash lookup
+    value_index: Dict[Any, List[int]] = {}
+    for index, alternative in enumerate(alternatives):
+        if isinstance(alternative, NoneSchema):
+            pinned = None
+        elif isinstance(alternative, _PINNED_TYPES) and (alternative.props.value is not Nil):
+            pinned = alternative.props.value
+        else:
+            return None
+        try:
+            value_index.setdefault(pinned, []).append(index)
+        except TypeError:
+            return None
+    return value_index
+
+
+class TypeIndex:
+    def __init__(self, alternatives: Sequence[GenericSchema]) -> None:
+        visitor = _AcceptedTypes()
+        self._accepted = [x.__accept__(visitor) for x in alternatives]
+        self._index: Dict[Type[Any], List[int]] = {}
+        self._value_index = _make_value_index(alternatives)
+
+    def lookup(self, value: Any) -> List[int]:
+        # positions (in declaration order) of alternatives that may accept the value
+        if self._value_index is not None:
+            try:
+                return self._value_index.get(value, [])
+            except TypeError:
+                pass
+
+        value_type = type(value)
+        positions = self._index.get(value_type)
+        if positions is None:
+            # list schemas accept arrays too (see SubstitutorValidator.visit_list),
+            # arrays are recognized by their type, so positions are still cached per type
+            is_array_type = is_array(value)
+            positions = [
+                index for index, accepted in enumerate(self._accepted)
+                if (accepted is None) or issubclass(value_type, accepted)
+                or (is_array_type and (list in accepted))
+            ]
+            self._index[value_type] = positions
+        return positions
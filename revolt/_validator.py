@@ -1,29 +1,138 @@
 from copy import deepcopy
-from typing import Any
+from threading import local
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
-from district42.types import DictSchema, ListSchema
+from district42 import GenericSchema
+from district42.types import AnySchema, DictSchema, ListSchema
 from district42.utils import is_ellipsis
 from niltype import Nil, Nilable
 from th import PathHolder
+from th.operators import AttrAccessor
 from valera import ValidationResult, Validator
 from valera.errors import (
     ExtraKeyValidationError,
     LengthValidationError,
     MaxLengthValidationError,
     MinLengthValidationError,
+    MissingElementValidationError,
+    SchemaMismatchValidationError,
+    ValidationError,
 )
 
+from ._arrays import array_to_list, check_array, is_array
+from ._matcher import BodyMatcher
+from ._plan_cache import PlanCache
+from ._profiler import Profiler
+from ._type_index import TypeIndex
+
 __all__ = ("SubstitutorValidator",)
 
 
+class _Trials(local):
+    # (props, value) of union alternatives matched while a union is substituted,
+    # both are kept alive, so their ids aren't reused until the union is done
+    matched: Optional[Dict[Tuple[int, int], Tuple[Any, Any]]] = None
+
+
+class _Profiling(local):
+    profiler: Optional[Profiler] = None
+
+
 class SubstitutorValidator(Validator):
+    def __init__(self, *,
+                 validation_result_factory: Callable[[], ValidationResult] = ValidationResult,
+                 path_holder_factory: Callable[[], PathHolder] = PathHolder) -> None:
+        super().__init__(validation_result_factory=validation_result_factory,
+                         path_holder_factory=path_holder_factory)
+        # nested values are validated relative to this shared (never extended) path,
+        # full paths are built only for reported errors
+        self._nested_path = path_holder_factory()
+        self._matchers: PlanCache[BodyMatcher] = PlanCache()
+        self._type_indexes: PlanCache[TypeIndex] = PlanCache()
+        self._trials = _Trials()
+        self._profiling = _Profiling()
+
+    def set_profiler(self, profiler: Optional[Profiler]) -> Optional[Profiler]:
+        # nested schemas are validated in frames of the paths their plans were compiled at
+        previous, self._profiling.profiler = self._profiling.profiler, profiler
+        return previous
+
+    def begin_trials(self) -> bool:
+        # union trials try alternatives of values the outermost plan has validated already,
+        # so matches are reused until the outermost plan is done (False for nested ones)
+        if self._trials.matched is not None:
+            return False
+        self._trials.matched = {}
+        return True
+
+    def end_trials(self) -> None:
+        self._trials.matched = None
+
+    def is_matched(self, schema: GenericSchema, value: Any) -> bool:
+        matched = self._trials.matched
+        if matched is None:
+            return False
+        entry = matched.get((id(schema.props), id(value)))
+        return (entry is not None) and (entry[1] is value)
+
+    def _join_path(self, path: PathHolder, key: Any, nested_path: PathHolder) -> PathHolder:
+        joined = deepcopy(path)[key]
+        for operator in nested_path:
+            if isinstance(operator, AttrAccessor):
+                joined = getattr(joined, operator.operand)
+            else:
+                joined = joined[operator.operand]
+        return joined
+
+    def _accept_nested(self, schema: GenericSchema, **kwargs: Any) -> ValidationResult:
+        profiler = self._profiling.profiler
+        if profiler is not None:
+            path = profiler.child_path(schema)
+            if path is not None:
+                return cast(ValidationResult,
+                            profiler.call(path, "validate", schema.__accept__, self, **kwargs))
+        return schema.__accept__(self, **kwargs)
+
+    def _validate_nested(self, schema: GenericSchema, value: Any, path: PathHolder, key: Any,
+                         **kwargs: Any) -> List[ValidationError]:
+        res = self._accept_nested(schema, value=value, path=self._nested_path, **kwargs)
+        errors = res.get_errors()
+        for error in errors:
+            error.path = self._join_path(path, key, error.path)  # type: ignore
+        return errors
+
+    def _validate_elements(self,
+                           path: PathHolder,
+                           value: List[Any],
+                           elements: List[GenericSchema],
+                           start: int = 0, *,
+                           fail_fast: bool = False,
+                           **kwargs: Any) -> List[ValidationError]:
+        errors: List[ValidationError] = []
+        for index, element_schema in enumerate(elements):
+            real_index = start + index
+            if real_index >= len(value):
+                errors.append(MissingElementValidationError(path, value, real_index))
+                break
+            errors += self._validate_nested(element_schema, value[real_index], path, real_index,
+                                            fail_fast=fail_fast, **kwargs)
+            if fail_fast and len(errors) > 0:
+                break
+        return errors
+
     def visit_list(self, schema: ListSchema, *,
                    value: Any = Nil, path: Nilable[PathHolder] = Nil,
-                   **kwargs: Any) -> ValidationResult:
+                   fail_fast: bool = False, **kwargs: Any) -> ValidationResult:
         result = self._validation_result_factory()
         if path is Nil:
             path = self._path_holder_factory()
 
+        if is_array(value):
+            if check_array(schema.props, value):
+                return result
+            # checked element by element to report errors
+            value = array_to_list(value)
+
         if error := self._validate_type(path, value, list):
             return result.add_error(error)
 
@@ -44,19 +153,39 @@ class SubstitutorValidator(Validator):
 
         if schema.props.type is not Nil:
             type_schema = schema.props.type
-            for index, elem in enumerate(value):
-                if is_ellipsis(elem) and (index == 0 or index == len(value) - 1):
-                    continue
-                nested_path = deepcopy(path)[index]
-                res = type_schema.__accept__(self, value=elem, path=nested_path, **kwargs)
-                result.add_errors(res.get_errors())
+            # leading and trailing ... are skipped, other elements are validated anyway
+            start = 1 if (len(value) > 0) and (value[0] is ...) else 0
+            stop = len(value) - 1 if (len(value) > start) and (value[-1] is ...) else len(value)
+            for index in range(start, stop):
+                result.add_errors(self._validate_nested(type_schema, value[index], path, index,
+                                                        fail_fast=fail_fast, **kwargs))
+                if fail_fast and result.has_errors():
+                    break
             return result
-        else:
-            return super().visit_list(schema, value=value, path=path, **kwargs)
+
+        elements = cast(List[GenericSchema], schema.props.elements)
+        if (len(elements) > 2) and is_ellipsis(elements[0]) and is_ellipsis(elements[-1]):
+            matcher = self._matchers.get(schema)
+            if matcher is None:
+                matcher = self._matchers.set(schema, BodyMatcher(elements[1:-1]))
+            # the first matching position wins, other positions matter only for errors
+            errors: List[ValidationError] = []
+            for index in matcher.candidates(value):
+                errors = self._validate_elements(path, value, elements[1:-1], index,
+                                                 fail_fast=True, **kwargs)
+                if len(errors) == 0:
+                    return result
+            if fail_fast:
+                if len(errors) == 0:
+                    errors = self._validate_elements(path, value, elements[1:-1],
+                                                     fail_fast=True, **kwargs)
+                return result.add_errors(errors)
+
+        return super().visit_list(schema, value=value, path=path, fail_fast=fail_fast, **kwargs)
 
     def visit_dict(self, schema: DictSchema, *,
                    value: Any = Nil, path: Nilable[PathHolder] = Nil,
-                   **kwargs: Any) -> ValidationResult:
+                   fail_fast: bool = False, **kwargs: Any) -> ValidationResult:
         result = self._validation_result_factory()
         if path is Nil:
             path = self._path_holder_factory()
@@ -71,13 +200,43 @@ class SubstitutorValidator(Validator):
             if is_ellipsis(key):
                 continue
             if key in value:
-                nested_path = deepcopy(path)[key]
-                res = val.__accept__(self, value=value[key], path=nested_path, **kwargs)
-                result.add_errors(res.get_errors())
+                result.add_errors(self._validate_nested(val, value[key], path, key,
+                                                        fail_fast=fail_fast, **kwargs))
+                if fail_fast and result.has_errors():
+                    return result
 
         if (... not in schema.props.keys) and (set(schema.props.keys) != set(value)):
             for key, val in value.items():
                 if key not in schema.props.keys:
                     result.add_error(ExtraKeyValidationError(path, value, key))
+                    if fail_fast:
+                        break
+
+        return result
+
+    def visit_any(self, schema: AnySchema, *,
+                  value: Any = Nil, path: Nilable[PathHolder] = Nil,
+                  **kwargs: Any) -> ValidationResult:
+        result = self._validation_result_factory()
+        if path is Nil:
+            path = self._path_holder_factory()
+
+        if schema.props.types is Nil:
+            return result
+
+        type_index = self._type_indexes.get(schema)
+        if type_index is None:
+            type_index = self._type_indexes.set(schema, TypeIndex(schema.props.types))
+
+        # alternatives that can't accept the value type would fail anyway
+        for position in type_index.lookup(value):
+            sch_type = schema.props.types[position]
+            res = self._accept_nested(sch_type, path=path, value=value, **kwargs)
+            if not res.has_errors():
+                matched = self._trials.matched
+                if matched is not None:
+                    matched[(id(sch_type.props), id(value))] = (sch_type.props, value)
+                return result
 
+        result.add_error(SchemaMismatchValidationError(path, value, schema.props.types))
         return result
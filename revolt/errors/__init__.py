@@ -1,13 +1,55 @@
+from typing import Any, List, Optional, Tuple
+
 from valera import Formatter, ValidationResult
+from valera.errors import ValidationError
 
 __all__ = ("SubstitutionError", "make_substitution_error",)
 
 
 class SubstitutionError(Exception):
-    pass
+    def __init__(self, message: Optional[str] = None, *,
+                 result: Optional[ValidationResult] = None,
+                 formatter: Optional[Formatter] = None) -> None:
+        super().__init__(*(() if message is None else (message,)))
+        self._message = message
+        self._result = result
+        self._formatter = formatter
+
+    @property
+    def result(self) -> Optional[ValidationResult]:
+        return self._result
+
+    @property
+    def errors(self) -> List[ValidationError]:
+        return self._result.get_errors() if (self._result is not None) else []
+
+    @property
+    def path(self) -> Tuple[Any, ...]:
+        errors = self.errors
+        if len(errors) == 0:
+            return ()
+        return tuple(operator.operand for operator in getattr(errors[0], "path", ()))
+
+    @property
+    def args(self) -> Tuple[Any, ...]:
+        # formatted on first access, as str() does
+        return (str(self),)
+
+    @args.setter
+    def args(self, args: Tuple[Any, ...]) -> None:
+        self._message = str(args[0]) if len(args) > 0 else None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({str(self)!r})"
+
+    def __str__(self) -> str:
+        # validation errors are formatted on demand, most of them are caught and discarded
+        if self._message is None:
+            formatter = self._formatter or Formatter()
+            errors = [e.format(formatter) for e in self.errors]
+            self._message = "\n - " + "\n - ".join(errors)
+        return self._message
 
 
 def make_substitution_error(result: ValidationResult, formatter: Formatter) -> SubstitutionError:
-    errors = [e.format(formatter) for e in result.get_errors()]
-    message = "\n - " + "\n - ".join(errors)
-    return SubstitutionError(message)
+    return SubstitutionError(result=result, formatter=formatter)
@@ -25,6 +25,7 @@ setup(
     packages=find_packages(exclude=("tests",)),
     package_data={"revolt": ["py.typed"]},
     install_requires=find_required(),
+    extras_require={"numpy": ["numpy"]},
     tests_require=find_dev_required(),
     classifiers=[
         "License :: OSI Approved :: Apache Software License",
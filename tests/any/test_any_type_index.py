@@ -0,0 +1,136 @@
+from typing import Any
+from unittest.mock import sentinel
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+
+from revolt import Substitutor, SubstitutorValidator, substitute
+from revolt._type_index import TypeIndex
+
+
+class CountingValidator(SubstitutorValidator):
+    def __init__(self) -> None:
+        super().__init__()
+        self.visited = 0
+
+    def visit_dict(self, schema: Any, **kwargs: Any) -> Any:
+        self.visited += 1
+        return super().visit_dict(schema, **kwargs)
+
+
+@pytest.mark.parametrize(("value", "positions"), [
+    (1, [0, 4, 5]),
+    (True, [0, 4, 5]),
+    ("banana", [1, 4, 5]),
+    (None, [2, 4, 5]),
+    ({}, [3, 4, 5]),
+    (sentinel, [4, 5]),
+])
+def test_type_index_lookup(value: Any, positions: Any):
+    with given:
+        index = TypeIndex([schema.int, schema.str, schema.none, schema.dict, schema.any,
+                           schema.const(1)])
+
+    with when:
+        res = index.lookup(value)
+
+    with then:
+        assert res == positions
+
+
+def test_type_index_nested_any_lookup():
+    with given:
+        index = TypeIndex([schema.any(schema.int, schema.str), schema.float])
+
+    with when:
+        res = index.lookup("banana")
+
+    with then:
+        assert res == [0]
+
+
+def test_any_skips_implausible_alternatives():
+    with given:
+        validator = CountingValidator()
+        substitutor = Substitutor(validator)
+        sch = schema.any(schema.int, schema.str, schema.none, schema.dict({"id": schema.int}))
+
+    with when:
+        res = sch.__accept__(substitutor, value=42)
+
+    with then:
+        assert res == schema.any(schema.int(42))
+        assert validator.visited == 0
+
+
+@pytest.mark.parametrize("value", [1, True, 3.14, "1", None])
+def test_any_substitutes_all_matching_alternatives(value: Any):
+    with given:
+        sch = schema.any(schema.int, schema.bool, schema.float, schema.str, schema.const(1),
+                         schema.any)
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        expected = []
+        for alternative in sch.props.types:
+            try:
+                expected.append(substitute(alternative, value))
+            except Exception:
+                pass
+        assert res == schema.any(*expected)
+
+
+def test_validator_any_skips_implausible_alternatives():
+    with given:
+        validator = CountingValidator()
+        sch = schema.dict({"val": schema.any(schema.dict({"id": schema.int}), schema.int)})
+
+    with when:
+        res = sch.__accept__(validator, value={"val": 42})
+
+    with then:
+        assert res.get_errors() == []
+        assert validator.visited == 1
+
+
+@pytest.mark.parametrize(("value", "positions"), [
+    ("A", [0]),
+    ("Z", []),
+    (1, [2, 3, 4]),
+    (True, [2, 3, 4]),
+    (None, [5]),
+    ([], [4]),
+])
+def test_type_index_value_lookup(value: Any, positions: Any):
+    with given:
+        index = TypeIndex([schema.str("A"), schema.str("B"), schema.int(1), schema.bool(True),
+                           schema.const(1), schema.none])
+
+    with when:
+        res = index.lookup(value)
+
+    with then:
+        assert res == positions
+
+
+@pytest.mark.parametrize("value", ["A", "Y", 1, True, 1.0, None])
+def test_any_enum_substitution(value: Any):
+    with given:
+        alternatives = [schema.str(x) for x in "ABCDEFGHIJKLMNOPQRSTUVWXY"]
+        sch = schema.any(*alternatives, schema.int(1), schema.bool(True), schema.const(1),
+                         schema.none)
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        expected = []
+        for alternative in sch.props.types:
+            try:
+                expected.append(substitute(alternative, value))
+            except Exception:
+                pass
+        assert res == schema.any(*expected)
@@ -0,0 +1,124 @@
+import json
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt._cli import load_schema, main
+
+UserSchema = schema.dict({"id": schema.int})
+
+
+def test_load_schema():
+    with when:
+        res = load_schema("tests.cli.test_cli:UserSchema")
+
+    with then:
+        assert res is UserSchema
+
+
+def test_load_schema_invalid_reference():
+    with when, raises(Exception) as exception:
+        load_schema("tests.cli.test_cli")
+
+    with then:
+        assert exception.type is ValueError
+
+
+def test_load_schema_not_schema():
+    with when, raises(Exception) as exception:
+        load_schema("tests.cli.test_cli:main")
+
+    with then:
+        assert exception.type is ValueError
+
+
+def test_cli_jsonl(tmp_path, capsys):
+    with given:
+        path = tmp_path / "values.jsonl"
+        path.write_text('{"id": 1}\n')
+
+    with when:
+        code = main(["jsonl", "tests.cli.test_cli:UserSchema", str(path)])
+
+    with then:
+        assert code == 0
+        records = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+        assert records == [{"line": 1, "result": repr(schema.dict({"id": schema.int(1)}))}]
+
+
+def test_cli_jsonl_errors(tmp_path, capsys):
+    with given:
+        path = tmp_path / "values.jsonl"
+        path.write_text('{"id": 1}\n{"id": "2"}\n')
+
+    with when:
+        code = main(["jsonl", "tests.cli.test_cli:UserSchema", str(path)])
+
+    with then:
+        assert code == 1
+        records = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+        assert [x["line"] for x in records] == [1, 2]
+        assert "error" in records[1]
+
+
+def test_cli_jsonl_blank_lines(tmp_path, capsys):
+    with given:
+        path = tmp_path / "values.jsonl"
+        path.write_text('{"id": 1}\n\n{"id": 2}\n\n')
+
+    with when:
+        code = main(["jsonl", "tests.cli.test_cli:UserSchema", str(path)])
+
+    with then:
+        assert code == 0
+        records = [json.loads(x) for x in capsys.readouterr().out.splitlines()]
+        assert [x["line"] for x in records] == [1, 3]
+
+
+@pytest.mark.parametrize("reference", [
+    "tests.cli.test_cli",
+    "tests.cli.test_cli:main",
+    "tests.cli.test_cli:Unknown",
+    "tests.cli.unknown:UserSchema",
+])
+def test_cli_schema_load_error(reference, tmp_path, capsys):
+    with given:
+        path = tmp_path / "values.jsonl"
+        path.write_text('{"id": 1}\n')
+
+    with when, raises(SystemExit) as exception:
+        main(["jsonl", reference, str(path)])
+
+    with then:
+        assert exception.value.code == 2
+        assert f"can't load schema {reference!r}" in capsys.readouterr().err
+
+
+def test_cli_profile(tmp_path, capsys):
+    with given:
+        path = tmp_path / "value.json"
+        path.write_text('{"id": 1}')
+
+    with when:
+        code = main(["profile", "tests.cli.test_cli:UserSchema", str(path)])
+
+    with then:
+        assert code == 0
+        stacks = [x.rsplit(" ", 1)[0] for x in capsys.readouterr().out.splitlines()]
+        assert set(stacks) <= {"root", "root;(validate)", "root;id", "root;id;(validate)"}
+        assert "root;(validate)" in stacks
+
+
+def test_cli_profile_error(tmp_path, capsys):
+    with given:
+        path = tmp_path / "value.json"
+        path.write_text('{"id": "1"}')
+
+    with when:
+        code = main(["profile", "tests.cli.test_cli:UserSchema", str(path)])
+
+    with then:
+        assert code == 1
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,76 @@
+from unittest.mock import Mock
+
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+from valera import Formatter, ValidationResult
+
+from revolt import Substitutor, substitute
+from revolt.errors import SubstitutionError, make_substitution_error
+
+
+def test_substitution_error_message():
+    with when:
+        error = SubstitutionError("Can't substitute ...")
+
+    with then:
+        assert str(error) == "Can't substitute ..."
+        assert error.result is None
+        assert error.errors == []
+        assert error.path == ()
+
+
+def test_substitution_error_structured():
+    with given:
+        sch = schema.dict({"items": schema.list(schema.int)})
+
+    with when, raises(SubstitutionError) as exception:
+        substitute(sch, {"items": [1, "2"]})
+
+    with then:
+        assert exception.value.result is not None
+        assert len(exception.value.errors) == 1
+        assert exception.value.path == ("items", 1)
+        assert str(exception.value) == (
+            "\n - Value '2' at _['items'][1] must be <class 'int'>, but <class 'str'> given"
+        )
+
+
+def test_substitution_error_formatted_on_demand():
+    with given:
+        formatter = Mock(Formatter)
+        formatter.format_type_error.return_value = "type error"
+        substitutor = Substitutor(formatter=formatter)
+        sch = schema.int | schema.dict({"id": schema.int})
+
+    with when:
+        res = sch.__accept__(substitutor, value={"id": 1})
+
+    with then:
+        assert res == schema.any(schema.dict({"id": schema.int(1)}))
+        assert formatter.format_type_error.call_count == 0
+
+
+def test_make_substitution_error():
+    with given:
+        result = ValidationResult()
+
+    with when:
+        error = make_substitution_error(result, Formatter())
+
+    with then:
+        assert isinstance(error, SubstitutionError)
+        assert error.result is result
+
+
+def test_substitution_error_args_and_repr():
+    with given:
+        sch = schema.int
+
+    with when, raises(SubstitutionError) as exception:
+        substitute(sch, "1")
+
+    with then:
+        message = "\n - Value '1' must be <class 'int'>, but <class 'str'> given"
+        assert exception.value.args == (message,)
+        assert repr(exception.value) == f"SubstitutionError({message!r})"
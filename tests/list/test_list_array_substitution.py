@@ -0,0 +1,119 @@
+import subprocess
+import sys
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+from pytest import raises
+
+from revolt import substitute
+from revolt.errors import SubstitutionError
+
+numpy = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(schema.float), [0.5, 1.5, -2.0]),
+    (schema.list(schema.float.min(0.0).max(1.0)), [0.0, 0.5, 1.0]),
+    (schema.list(schema.float(0.1)), [0.1, 0.1]),
+    (schema.list(schema.int), [1, 2, 3]),
+    (schema.list(schema.int.min(1)), [1, 2, 3]),
+    (schema.list(schema.int(7)).len(2), [7, 7]),
+    (schema.list(schema.int), []),
+])
+def test_list_numpy_array_substitution(sch: GenericSchema, value: Any):
+    with when:
+        res = substitute(sch, numpy.array(value, dtype=type(value[0]) if value else float))
+
+    with then:
+        assert res == substitute(sch, value)
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(schema.float), numpy.array([1, 2])),
+    (schema.list(schema.int), numpy.array([1.0, 2.0])),
+    (schema.list(schema.float.max(1.0)), numpy.array([0.5, 1.5])),
+    (schema.list(schema.int.min(0)), numpy.array([-1, 2])),
+    (schema.list(schema.float(1.0)), numpy.array([1.0, numpy.inf])),
+    (schema.list(schema.int).len(3), numpy.array([1, 2])),
+])
+def test_list_numpy_array_substitution_error(sch: GenericSchema, value: Any):
+    with when, raises(Exception) as exception:
+        substitute(sch, value)
+
+    with then:
+        assert exception.type is SubstitutionError
+        assert str(exception.value) == str(_error(sch, value.tolist()))
+
+
+def _error(sch: GenericSchema, value: Any) -> SubstitutionError:
+    with raises(SubstitutionError) as exception:
+        substitute(sch, value)
+    return exception.value
+
+
+def test_nested_numpy_array_substitution():
+    with given:
+        sch = schema.dict({"series": schema.list(schema.float)})
+        value = {"series": numpy.linspace(0.0, 1.0, 5)}
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        assert res == substitute(sch, {"series": value["series"].tolist()})
+
+
+def test_2d_numpy_array_substitution():
+    with given:
+        sch = schema.list(schema.list(schema.int))
+        value = numpy.array([[1, 2], [3, 4]])
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        assert res == substitute(sch, [[1, 2], [3, 4]])
+
+
+@pytest.mark.parametrize(("sch", "value", "native"), [
+    (schema.any(schema.list(schema.int), schema.none), numpy.array([1, 2]), [1, 2]),
+    (schema.list([..., schema.list(schema.int), ...]), [numpy.array([1])], [[1]]),
+    (schema.list([schema.list(schema.int), ...]), [numpy.array([1]), 2], [[1], 2]),
+])
+def test_numpy_array_in_any_and_pattern_substitution(sch: GenericSchema, value: Any,
+                                                     native: Any):
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        assert res == substitute(sch, native)
+
+
+@pytest.mark.parametrize("value", [numpy.int64(5), numpy.float64(0.5), numpy.array(5)])
+def test_numpy_scalar_isnt_array(value: Any):
+    with when, raises(Exception) as exception:
+        substitute(schema.list(schema.int), value)
+
+    with then:
+        assert exception.type is SubstitutionError
+        assert f"{type(value)} given" in str(exception.value)
+
+
+def test_numpy_array_with_any_dtype_substitution():
+    with when:
+        res = substitute(schema.list(schema.str), numpy.array(["a", "b"]))
+
+    with then:
+        assert res == schema.list([schema.str("a"), schema.str("b")])
+
+
+def test_import_doesnt_load_numpy():
+    with when:
+        result = subprocess.run([sys.executable, "-c",
+                                 "import sys, revolt; print('numpy' in sys.modules)"],
+                                capture_output=True, text=True, check=True)
+
+    with then:
+        assert result.stdout.strip() == "False"
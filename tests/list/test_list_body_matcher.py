@@ -0,0 +1,74 @@
+from typing import Any, List
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+
+from revolt import SubstitutorValidator, substitute
+from revolt._matcher import BodyMatcher
+
+
+def brute_force_positions(elements: List[GenericSchema], value: List[Any]) -> List[int]:
+    validator = SubstitutorValidator()
+    positions = []
+    for index in range(len(value) - len(elements) + 1):
+        results = [x.__accept__(validator, value=value[index + i]) for i, x in enumerate(elements)]
+        if not any(res.has_errors() for res in results):
+            positions.append(index)
+    return positions
+
+
+@pytest.mark.parametrize(("elements", "value"), [
+    ([schema.int(1), schema.int(1), schema.int(2)], [1, 1, 1, 1, 2, 1, 1, 2]),
+    ([schema.int(1), schema.int(2), schema.int(1)], [1, 2, 1, 2, 1, 2, 1]),
+    ([schema.str("a"), schema.none], ["a", None, "a", "a", None]),
+    ([schema.int(1), schema.bool(True)], [True, True, 1, True]),
+    ([schema.int(1)], [True, 1, 1.0, "1"]),
+    ([schema.int, schema.str], [1, "a", "b", 2, 3, "c"]),
+    ([schema.float(0.1)], [0.1, 0.30000000000000004 - 0.2, 1]),
+    ([schema.const(1), schema.any(schema.int, schema.str)], [1, 1, "a", None]),
+    ([schema.dict, schema.list], [{}, [], {}, {}, []]),
+    ([schema.dict({"id": schema.int(1)})], [{"id": 2}, {"id": 1}, {"id": 1, "x": 1}, {}]),
+    ([schema.dict({"id": schema.int(1), ...: ...})], [{"id": 1, "x": 1}, {"x": 1}]),
+])
+def test_body_matcher_candidates(elements: List[GenericSchema], value: List[Any]):
+    with given:
+        matcher = BodyMatcher(elements)
+
+    with when:
+        candidates = list(matcher.candidates(value))
+
+    with then:
+        assert set(brute_force_positions(elements, value)) <= set(candidates)
+        assert candidates == sorted(candidates)
+
+
+@pytest.mark.parametrize("value", [
+    [1, 1, 1, 2, 3],
+    [0] * 100 + [1, 2, 3] + [0] * 100,
+    ["x", 1, 2, 3],
+])
+def test_list_body_substitution(value: List[Any]):
+    with given:
+        sch = schema.list([..., schema.int(1), schema.int(2), schema.int(3), ...])
+        index = next(i for i in range(len(value)) if value[i:i + 3] == [1, 2, 3])
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        body = [schema.int(1), schema.int(2), schema.int(3)]
+        assert res.props.elements[index:index + 3] == body
+        assert len(res.props.elements) == len(value)
+
+
+def test_list_long_body_substitution():
+    with given:
+        sch = schema.list([..., schema.dict({"type": schema.str("end")}), ...])
+        value = [{"type": "event"}] * 50_000 + [{"type": "end"}]
+
+    with when:
+        res = substitute(sch, value)
+
+    with then:
+        assert res.props.elements[-1] == schema.dict({"type": schema.str("end")})
@@ -0,0 +1,46 @@
+from array import array
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import substitute
+from revolt.errors import SubstitutionError
+
+
+def test_buffer_substitution():
+    with given:
+        sch = schema.list(schema.float)
+
+    with when:
+        res = substitute(sch, memoryview(array("d", [0.5, 1.5])))
+
+    with then:
+        assert res == schema.list([schema.float(0.5), schema.float(1.5)])
+
+
+def test_untyped_list_array_substitution():
+    with given:
+        sch = schema.list
+
+    with when:
+        res = substitute(sch, array("i", [1, 2]))
+
+    with then:
+        assert res == schema.list([schema.int(1), schema.int(2)])
+
+
+@pytest.mark.parametrize("value", [
+    array("u", "ab"),
+    memoryview(b"abcd").cast("B", shape=[2, 2]),
+    memoryview(array("i", [1])).cast("B").cast("i", shape=[]),
+])
+def test_unsupported_buffer_substitution_error(value: Any):
+    with when, raises(Exception) as exception:
+        substitute(schema.list(schema.int), value)
+
+    with then:
+        assert exception.type is SubstitutionError
+        assert f"{type(value)} given" in str(exception.value)
@@ -0,0 +1,77 @@
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import substitute
+from revolt.errors import SubstitutionError
+
+
+class EqualToAnything(str):
+    calls = 0
+
+    def __eq__(self, other: Any) -> bool:
+        EqualToAnything.calls += 1
+        return True
+
+    __hash__ = str.__hash__
+
+
+def test_list_elements_substitution_doesnt_compare_elements_with_ellipsis():
+    with given:
+        sch = schema.list([schema.str, schema.str])
+        EqualToAnything.calls = 0
+
+    with when:
+        res = substitute(sch, [EqualToAnything("a"), "b"])
+
+    with then:
+        assert res == schema.list([schema.str(EqualToAnything("a")), schema.str("b")])
+        assert EqualToAnything.calls == 0
+
+
+@pytest.mark.parametrize("value", [
+    [..., 1],
+    [1, ...],
+    [1, ..., 2],
+])
+def test_list_elements_substitution_with_ellipsis_error(value):
+    with given:
+        sch = schema.list([schema.int, schema.any, schema.int])
+
+    with when, raises(SubstitutionError) as exception:
+        substitute(sch, value)
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+@pytest.mark.parametrize(("value", "expected"), [
+    ([..., 1], [..., schema.int(1)]),
+    ([1, ...], [schema.int(1), ...]),
+    ([..., 1, ...], [..., schema.int(1), ...]),
+])
+@pytest.mark.parametrize("lazy", [False, True])
+def test_list_type_substitution_keeps_edge_ellipsis(value, expected, lazy):
+    with given:
+        sch = schema.list(schema.int)
+
+    with when:
+        res = substitute(sch, value, lazy=lazy)
+
+    with then:
+        assert res == schema.list(expected)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_list_substitution_keeps_ellipsis(lazy):
+    with given:
+        sch = schema.list
+
+    with when:
+        res = substitute(sch, [..., 1, "a", ...], lazy=lazy)
+
+    with then:
+        assert res == schema.list([..., schema.int(1), schema.str("a"), ...])
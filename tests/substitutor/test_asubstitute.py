@@ -0,0 +1,182 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import asubstitute, substitute
+from revolt.errors import SubstitutionError
+
+
+def test_asubstitute():
+    with given:
+        sch = schema.dict({"id": schema.int, "tags": schema.list(schema.str)})
+        value = {"id": 1, "tags": ["a", "b"]}
+
+    with when:
+        res = asyncio.run(asubstitute(sch, value))
+
+    with then:
+        assert res == substitute(sch, value)
+
+
+def test_asubstitute_kwargs():
+    with given:
+        sch = schema.list(schema.int)
+
+    with when:
+        res = asyncio.run(asubstitute(sch, [1, 2], lazy=True))
+
+    with then:
+        assert res == schema.list([schema.int(1), schema.int(2)])
+
+
+def test_asubstitute_error():
+    with given:
+        sch = schema.list(schema.int)
+        value = [1, "2", "3"]
+
+        with raises(SubstitutionError) as expected:
+            substitute(sch, value)
+
+    with when, raises(SubstitutionError) as exception:
+        asyncio.run(asubstitute(sch, value))
+
+    with then:
+        assert str(exception.value) == str(expected.value)
+
+
+def test_asubstitute_executor():
+    with given:
+        sch = schema.list(schema.int)
+
+    with when:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            res = asyncio.run(asubstitute(sch, [1, 2], executor=executor))
+
+    with then:
+        assert res == schema.list([schema.int(1), schema.int(2)])
+
+
+def test_asubstitute_doesnt_block_loop():
+    with given:
+        sch = schema.list(schema.dict({"id": schema.int, "name": schema.str}))
+        value = [{"id": i, "name": str(i)} for i in range(5_000)]
+        ticks = []
+
+        async def tick() -> None:
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def main():
+            ticker = asyncio.create_task(tick())
+            await asyncio.sleep(0)
+            ticks.clear()
+            res = await asubstitute(sch, value)
+            ticker.cancel()
+            return res
+
+    with when:
+        res = asyncio.run(main())
+
+    with then:
+        assert len(res.props.elements) == 5_000
+        assert len(ticks) > 1
+
+
+def run_with_ticker(coroutine_fn):
+    ticks = []
+
+    async def tick() -> None:
+        while True:
+            ticks.append(1)
+            await asyncio.sleep(0)
+
+    async def main():
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        ticks.clear()
+        try:
+            return await coroutine_fn()
+        finally:
+            ticker.cancel()
+
+    return asyncio.run(main()), len(ticks)
+
+
+@pytest.mark.parametrize("yield_every", [100, 250])
+def test_asubstitute_yields_every_n_elements(yield_every: int):
+    with given:
+        sch = schema.list(schema.int)
+        value = list(range(1_000))
+
+    with when:
+        res, ticks = run_with_ticker(lambda: asubstitute(sch, value, yield_every=yield_every))
+
+    with then:
+        assert res == substitute(sch, value)
+        # validated, then substituted, a chunk per tick
+        assert ticks == pytest.approx(2 * len(value) / yield_every, abs=2)
+
+
+def test_asubstitute_yields_every_n_keys():
+    with given:
+        sch = schema.dict({f"key{i}": schema.int for i in range(1_000)})
+        value = {f"key{i}": i for i in range(1_000)}
+
+    with when:
+        res, ticks = run_with_ticker(lambda: asubstitute(sch, value, yield_every=100))
+
+    with then:
+        assert res == substitute(sch, value)
+        assert ticks == pytest.approx(20, abs=2)
+
+
+def test_asubstitute_small_value_doesnt_yield():
+    with given:
+        sch = schema.list(schema.int)
+
+    with when:
+        res, ticks = run_with_ticker(lambda: asubstitute(sch, [1, 2], yield_every=100))
+
+    with then:
+        assert res == schema.list([schema.int(1), schema.int(2)])
+        assert ticks == 0
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(schema.int), [1, "2"] * 500),
+    (schema.list(schema.int).len(10), list(range(1_000))),
+    (schema.dict({f"key{i}": schema.int for i in range(1_000)}),
+     {**{f"key{i}": str(i) for i in range(1_000)}, "extra": 1}),
+    (schema.dict({f"key{i}": schema.int for i in range(1_000)}), [1]),
+])
+@pytest.mark.parametrize("fail_fast", [False, True])
+def test_asubstitute_chunked_error(sch, value, fail_fast: bool):
+    with given:
+        with raises(SubstitutionError) as expected:
+            substitute(sch, value, fail_fast=fail_fast)
+
+    with when, raises(SubstitutionError) as exception:
+        asyncio.run(asubstitute(sch, value, yield_every=100, fail_fast=fail_fast))
+
+    with then:
+        assert str(exception.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("value", [
+    list(range(1_000)),
+    [..., *range(1_000)],
+])
+def test_asubstitute_chunked_lazy_and_ellipsis(value):
+    with given:
+        sch = schema.list(schema.int)
+
+    with when:
+        res = asyncio.run(asubstitute(sch, value, yield_every=100, lazy=True))
+
+    with then:
+        assert res == substitute(sch, value)
@@ -0,0 +1,120 @@
+import gc
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+from pytest import raises
+
+from revolt import Substitutor, substitute
+from revolt.errors import SubstitutionError
+
+
+def test_compile_returns_cached_plan():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int})
+
+    with when:
+        plan = substitutor.compile(sch)
+
+    with then:
+        assert substitutor.compile(sch) is plan
+
+
+def test_compiled_plan_substitution():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int, "tags": schema.list(schema.str)})
+        plan = substitutor.compile(sch)
+
+    with when:
+        res = plan({"id": 1, "tags": ["a"]})
+
+    with then:
+        assert res == schema.dict({"id": schema.int(1), "tags": schema.list([schema.str("a")])})
+
+
+def test_compiled_plan_substitution_error():
+    with given:
+        substitutor = Substitutor()
+        plan = substitutor.compile(schema.dict({"id": schema.int}))
+
+    with when, raises(Exception) as exception:
+        plan({"id": "1"})
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+def test_compiled_plan_evicted_with_schema():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int})
+        substitutor.compile(sch)
+
+    with when:
+        del sch
+        gc.collect()
+
+    with then:
+        assert len(substitutor._plans) == 0
+
+
+def test_compiled_plan_outlives_schema():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.list(schema.int)
+        plan = substitutor.compile(sch)
+        del sch
+        gc.collect()
+
+    with when:
+        res = plan([1])
+
+    with then:
+        assert res == schema.list([schema.int(1)])
+
+
+def test_substitute_mod_use_same_plan():
+    with given:
+        sch = schema.dict({"id": schema.int})
+
+    with when:
+        res1 = substitute(sch, {"id": 1})
+        res2 = sch % {"id": 1}
+
+    with then:
+        assert res1 == res2
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.none, None),
+    (schema.bool, True),
+    (schema.int, 1),
+    (schema.float, 1.0),
+    (schema.str, "a"),
+    (schema.bytes, b"a"),
+    (schema.const(1), 1),
+])
+def test_leaf_plans_not_cached(sch: GenericSchema, value: Any):
+    with given:
+        substitutor = Substitutor()
+
+    with when:
+        res = substitutor.compile(sch)(value)
+
+    with then:
+        assert res == sch.__accept__(Substitutor(), value=value)
+        assert len(substitutor._plans) == 0
+
+
+def test_leaf_plan_substitution_error():
+    with given:
+        substitutor = Substitutor()
+
+    with when, raises(Exception) as exception:
+        substitutor.compile(schema.int)("1")
+
+    with then:
+        assert exception.type is SubstitutionError
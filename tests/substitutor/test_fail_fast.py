@@ -0,0 +1,70 @@
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+from pytest import raises
+
+from revolt import Substitutor, SubstitutorValidator, substitute
+from revolt.errors import SubstitutionError
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(schema.int), [1, "2", "3"]),
+    (schema.dict({"a": schema.int, "b": schema.int}), {"a": "1", "b": "2"}),
+    (schema.dict({"a": schema.int}), {"a": 1, "b": 2, "c": 3}),
+    (schema.list([schema.int, schema.int, ...]), ["1", "2"]),
+])
+def test_fail_fast_substitution_error(sch: GenericSchema, value: Any):
+    with when, raises(SubstitutionError) as exception:
+        substitute(sch, value, fail_fast=True)
+
+    with then:
+        assert len(exception.value.errors) == 1
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(schema.int), [1, "2", "3"]),
+    (schema.dict({"a": schema.int}), {"a": 1, "b": 2, "c": 3}),
+])
+def test_substitutor_fail_fast(sch: GenericSchema, value: Any):
+    with given:
+        substitutor = Substitutor(fail_fast=True)
+
+    with when, raises(SubstitutionError) as exception:
+        sch.__accept__(substitutor, value=value)
+
+    with then:
+        assert len(exception.value.errors) == 1
+
+
+def test_collect_all_errors_by_default():
+    with when, raises(SubstitutionError) as exception:
+        substitute(schema.list(schema.int), [1, "2", "3"])
+
+    with then:
+        assert len(exception.value.errors) == 2
+
+
+def test_fail_fast_substitution():
+    with given:
+        sch = schema.list([..., schema.int(2), schema.int(3), ...])
+
+    with when:
+        res = substitute(sch, [1, 2, 3, 4], fail_fast=True)
+
+    with then:
+        assert res == substitute(sch, [1, 2, 3, 4])
+
+
+@pytest.mark.parametrize("value", [[], [1, 2], [1, 3, 2]])
+def test_fail_fast_validator_body_error(value: Any):
+    with given:
+        validator = SubstitutorValidator()
+        sch = schema.list([..., schema.int(2), schema.int(3), ...])
+
+    with when:
+        res = sch.__accept__(validator, value=value, fail_fast=True)
+
+    with then:
+        assert len(res.get_errors()) == 1
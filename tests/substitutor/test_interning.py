@@ -0,0 +1,89 @@
+from baby_steps import given, then, when
+from district42 import schema
+
+from revolt import Substitutor
+
+UserSchema = schema.dict({"id": schema.int, "name": schema.str, "tags": schema.list(schema.str)})
+
+
+def test_interning_shares_equal_nodes():
+    with given:
+        substitutor = Substitutor(interning=True)
+        value = [{"id": 1, "name": "Bob", "tags": ["a"]}, {"id": 1, "name": "Bob", "tags": ["a"]},
+                 {"id": 2, "name": "Bob", "tags": []}]
+
+    with when:
+        res = substitutor.compile(schema.list(UserSchema))(value)
+
+    with then:
+        assert res == Substitutor().compile(schema.list(UserSchema))(value)
+        first, second, third = res.props.elements
+        assert first is second
+        assert first.props.keys["name"][0] is third.props.keys["name"][0]
+        assert first.props.keys["id"][0] is not third.props.keys["id"][0]
+
+
+def test_interning_shares_nodes_between_results():
+    with given:
+        substitutor = Substitutor(interning=True)
+        plan = substitutor.compile(UserSchema)
+
+    with when:
+        first = plan({"id": 1, "name": "Bob", "tags": ["a", "b"]})
+        second = plan({"id": 1, "name": "Bob", "tags": ["a", "b"]})
+
+    with then:
+        assert first is second
+
+
+def test_interning_doesnt_mix_equal_values():
+    with given:
+        substitutor = Substitutor(interning=True)
+
+    with when:
+        res = substitutor.compile(schema.list)([1, True, 1.0, 0.0, -0.0])
+
+    with then:
+        assert [repr(x) for x in res.props.elements] == [
+            "schema.int(1)", "schema.bool(True)", "schema.float(1.0)",
+            "schema.float(0.0)", "schema.float(-0.0)",
+        ]
+
+
+def test_interning_stats():
+    with given:
+        substitutor = Substitutor(interning=True)
+
+    with when:
+        res = substitutor.compile(schema.list(schema.int))([1, 1, 1])
+
+    with then:
+        stats = substitutor.intern_stats()
+        assert (stats.nodes, stats.deduplicated) == (2, 2)
+        assert stats.saved_bytes > 0
+        assert res.props.elements[0] is res.props.elements[2]
+
+
+def test_interning_disabled():
+    with given:
+        substitutor = Substitutor(native_cache_size=0)
+
+    with when:
+        res = substitutor.compile(schema.list(schema.int))([1, 1])
+
+    with then:
+        assert res.props.elements[0] is not res.props.elements[1]
+        stats = substitutor.intern_stats()
+        assert (stats.nodes, stats.deduplicated, stats.saved_bytes) == (0, 0, 0)
+
+
+def test_interning_skips_lazy_results():
+    with given:
+        substitutor = Substitutor(interning=True)
+
+    with when:
+        res = substitutor.compile(UserSchema)({"id": 1, "name": "Bob", "tags": []}, lazy=True)
+
+    with then:
+        assert res == substitutor.compile(UserSchema)({"id": 1, "name": "Bob", "tags": []})
+        assert substitutor.intern_stats().deduplicated == 0
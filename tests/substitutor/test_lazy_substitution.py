@@ -0,0 +1,178 @@
+from typing import Any
+from unittest.mock import sentinel
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+from pytest import raises
+
+from revolt import substitute
+from revolt.errors import SubstitutionError
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.dict, {"id": 1, "tags": ["a", "b"]}),
+    (schema.dict({"id": schema.int, "name": schema.str}), {"id": 1}),
+    (schema.dict({"id": schema.int, ...: ...}), {"id": 1}),
+    (schema.dict({...: ...}), {"id": 1}),
+    (schema.list, [1, "2", None]),
+    (schema.list(schema.dict({"id": schema.int})), [{"id": 1}, {"id": 2}]),
+    (schema.list([schema.int, ...]), [1, 2, 3]),
+    (schema.list([..., schema.int]), [1, 2, 3]),
+    (schema.list([..., schema.int(2), ...]), [1, 2, 3]),
+    (schema.list([schema.int, schema.str]), [1, "2"]),
+])
+def test_lazy_substitution(sch: GenericSchema, value: Any):
+    with when:
+        res = substitute(sch, value, lazy=True)
+
+    with then:
+        assert res == substitute(sch, value)
+        assert repr(res) == repr(substitute(sch, value))
+
+
+def test_lazy_dict_children_substituted_on_access():
+    with given:
+        sch = schema.dict({"id": schema.int, "tags": schema.list(schema.str)})
+        value = {"id": 1, "tags": ["a", "b"]}
+
+    with when:
+        res = substitute(sch, value, lazy=True)
+
+    with then:
+        assert res.props.keys["id"] == (schema.int(1), False)
+        assert res.props.keys["tags"] == (schema.list([schema.str("a"), schema.str("b")]), False)
+
+
+def test_lazy_list_children_substituted_on_access():
+    with given:
+        sch = schema.list
+        value = [1, [2, "3"]]
+
+    with when:
+        res = substitute(sch, value, lazy=True)
+
+    with then:
+        assert res.props.elements[0] == schema.int(1)
+        assert res.props.elements[1] == schema.list([schema.int(2), schema.str("3")])
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.dict, {"id": 1, "val": sentinel}),
+    (schema.dict({...: ...}), {"a": [1, ...]}),
+    (schema.list, [1, sentinel]),
+    (schema.list, [1, [2, ...]]),
+    (schema.list([schema.int, ...]), [1, 2, {"a": ...}]),
+    (schema.list([..., schema.int]), [sentinel, 2]),
+    (schema.list([..., schema.int(2), ...]), [1, 2, [...]]),
+])
+def test_lazy_conversion_error_reported_up_front(sch: GenericSchema, value: Any):
+    with when, raises(Exception) as exception:
+        substitute(sch, value, lazy=True)
+
+    with then:
+        assert exception.type is SubstitutionError
+        with raises(SubstitutionError):
+            substitute(sch, value)
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.any(schema.dict, schema.none), {"a": [1, ...]}),
+    (schema.any(schema.dict, schema.dict({"a": schema.list})), {"a": [1, ...]}),
+    (schema.any(schema.list(schema.dict), schema.list), [{"a": sentinel}]),
+    (schema.list([..., schema.dict, ...]), [1, {"a": [...]}, {"a": 2}]),
+])
+def test_lazy_trials_fail_as_eager_ones(sch: GenericSchema, value: Any):
+    with when:
+        try:
+            expected = substitute(sch, value)
+        except SubstitutionError:
+            expected = None
+        try:
+            res = substitute(sch, value, lazy=True)
+        except SubstitutionError:
+            res = None
+
+    with then:
+        assert res == expected
+
+
+def test_lazy_validation_error_reported_up_front():
+    with given:
+        sch = schema.dict({"items": schema.list(schema.dict({"id": schema.int}))})
+
+    with when, raises(Exception) as exception:
+        substitute(sch, {"items": [{"id": 1}, {"id": "2"}]}, lazy=True)
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+def test_lazy_unknown_key_error_reported_up_front():
+    with given:
+        sch = schema.dict({"id": schema.int})
+
+    with when, raises(Exception) as exception:
+        substitute(sch, {"id": 1, "name": "Bob"}, lazy=True)
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.dict, {"id": 1, "name": "Bob"}),
+    (schema.dict({"id": schema.int, "name": schema.str}), {"id": 1, "name": "Bob"}),
+    (schema.list, [1, 2]),
+    (schema.list(schema.int), [1, 2]),
+    (schema.list([schema.int, ...]), [1, 2]),
+])
+def test_lazy_substitution_doesnt_see_value_changes(sch: GenericSchema, value: Any):
+    with given:
+        expected = substitute(sch, value)
+        res = substitute(sch, value, lazy=True)
+
+    with when:
+        if isinstance(value, dict):
+            value["id"] = 2
+            value.pop("name")
+        else:
+            value[1] = 3
+            value.append(4)
+
+    with then:
+        assert res == expected
+
+
+@pytest.mark.parametrize("sch", [
+    schema.dict({"ids": schema.list(schema.int), "meta": schema.dict({"id": schema.int})}),
+    schema.dict({"ids": schema.list, "meta": schema.dict}),
+    schema.dict,
+])
+def test_lazy_substitution_doesnt_see_nested_value_changes(sch: GenericSchema):
+    with given:
+        value = {"ids": [1, 2], "meta": {"id": 1}}
+        expected = substitute(sch, value)
+        res = substitute(sch, value, lazy=True)
+
+    with when:
+        value["ids"].append("x")
+        value["meta"]["id"] = None
+
+    with then:
+        assert res.props.keys["ids"] == expected.props.keys["ids"]
+        assert res.props.keys["meta"] == expected.props.keys["meta"]
+
+
+def test_lazy_list_substitution_doesnt_see_nested_value_changes():
+    with given:
+        sch = schema.list([schema.list(schema.int), ...])
+        value = [[1], [2]]
+        expected = substitute(sch, value)
+        res = substitute(sch, value, lazy=True)
+
+    with when:
+        value[0].append("x")
+        value[1].append(None)
+
+    with then:
+        assert res == expected
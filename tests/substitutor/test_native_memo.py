@@ -0,0 +1,74 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import from_native, schema
+
+from revolt import Substitutor
+
+
+def test_native_memo_shares_scalar_schemas():
+    with given:
+        substitutor = Substitutor()
+
+    with when:
+        res = substitutor.compile(schema.list)(["banana", "banana", 1, 1])
+
+    with then:
+        elements = res.props.elements
+        assert elements == [schema.str("banana"), schema.str("banana"), schema.int(1),
+                            schema.int(1)]
+        assert elements[0] is elements[1]
+        assert elements[2] is elements[3]
+
+
+@pytest.mark.parametrize(("first", "second"), [
+    (1, True),
+    (1, 1.0),
+    (0.0, -0.0),
+    (b"1", "1"),
+])
+def test_native_memo_doesnt_mix_equal_values(first, second):
+    with given:
+        substitutor = Substitutor()
+
+    with when:
+        res = substitutor.compile(schema.list)([first, second])
+
+    with then:
+        assert repr(res.props.elements[1]) == repr(from_native(second))
+
+
+def test_native_memo_skips_containers():
+    with given:
+        substitutor = Substitutor()
+
+    with when:
+        res = substitutor.compile(schema.list)([[1], [1]])
+
+    with then:
+        assert res.props.elements[0] is not res.props.elements[1]
+        assert substitutor.native_cache_stats().size == 0
+
+
+def test_native_memo_stats():
+    with given:
+        substitutor = Substitutor(native_cache_size=2)
+
+    with when:
+        substitutor.compile(schema.dict({...: ...}))({"a": "x", "b": "x", "c": "y", "d": "z"})
+
+    with then:
+        stats = substitutor.native_cache_stats()
+        assert (stats.hits, stats.misses, stats.size, stats.max_size) == (1, 3, 2, 2)
+        assert stats.hit_rate == 0.25
+
+
+def test_native_memo_disabled():
+    with given:
+        substitutor = Substitutor(native_cache_size=0)
+
+    with when:
+        res = substitutor.compile(schema.list)(["banana", "banana"])
+
+    with then:
+        assert res.props.elements[0] is not res.props.elements[1]
+        assert substitutor.native_cache_stats().size == 0
@@ -0,0 +1,155 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from baby_steps import given, then, when
+from district42 import optional, schema
+from pytest import raises
+
+from revolt import substitute, substitute_many
+from revolt.errors import SubstitutionError
+
+UserSchema = schema.dict({"id": schema.int, "name": schema.str})
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        yield executor
+
+
+@pytest.mark.parametrize("value", [
+    [{"id": i, "name": str(i)} for i in range(10)],
+    [..., {"id": 1, "name": "1"}, {"id": 2, "name": "2"}, ...],
+    [],
+])
+def test_substitute_in_pool(value, pool):
+    with given:
+        sch = schema.list(UserSchema)
+
+    with when:
+        res = substitute(sch, value, pool=pool, chunk_size=3)
+
+    with then:
+        assert res == substitute(sch, value)
+
+
+@pytest.mark.parametrize("fail_fast", [False, True])
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.list(UserSchema), [{"id": 1, "name": "1"}, {"id": "2"}, {}, {"id": 4, "name": 4}]),
+    (schema.list(UserSchema).len(2), [{"id": 1, "name": "1"}] * 3),
+    (schema.list(schema.int), "123"),
+    (schema.list(schema.int), [..., ...]),
+])
+def test_substitute_in_pool_error(sch, value, fail_fast, pool):
+    with given:
+        with raises(SubstitutionError) as expected:
+            substitute(sch, value, fail_fast=fail_fast)
+
+    with when, raises(SubstitutionError) as exception:
+        substitute(sch, value, pool=pool, chunk_size=1, fail_fast=fail_fast)
+
+    with then:
+        assert str(exception.value) == str(expected.value)
+
+
+WideSchema = schema.dict({
+    "id": schema.int,
+    "name": schema.str,
+    "tags": schema.list(schema.str),
+    optional("email"): schema.str,
+})
+
+
+@pytest.mark.parametrize("value", [
+    {"id": 1, "name": "Bob", "tags": ["a", "b"], "email": "bob@localhost"},
+    {"id": 1, "name": "Bob", "tags": []},
+])
+def test_substitute_dict_in_pool(value, pool):
+    with when:
+        res = substitute(WideSchema, value, pool=pool, chunk_size=1)
+
+    with then:
+        assert res == substitute(WideSchema, value)
+
+
+@pytest.mark.parametrize("fail_fast", [False, True])
+@pytest.mark.parametrize("value", [
+    {"id": "1", "name": None, "tags": [1]},
+    {"id": 1, "name": "Bob", "tags": [], "x": 1, "y": 2},
+    {"id": 1, "tags": ["a"], ...: ...},
+    [],
+])
+def test_substitute_dict_in_pool_error(value, fail_fast, pool):
+    with given:
+        with raises(SubstitutionError) as expected:
+            substitute(WideSchema, value, fail_fast=fail_fast)
+
+    with when, raises(SubstitutionError) as exception:
+        substitute(WideSchema, value, pool=pool, chunk_size=1, fail_fast=fail_fast)
+
+    with then:
+        assert str(exception.value) == str(expected.value)
+
+
+def test_substitute_list_in_pool_lazy(pool):
+    with given:
+        sch = schema.list(schema.int)
+        value = list(range(10))
+
+    with when:
+        res = substitute(sch, value, pool=pool, chunk_size=3, lazy=True)
+
+    with then:
+        assert res == substitute(sch, value)
+
+
+def test_substitute_many_in_pool(pool):
+    with given:
+        values = [{"id": 1, "name": "1"}, {"id": "2"}, {"id": 3, "name": "3", "x": 1}, []]
+
+    with when:
+        res = substitute_many(UserSchema, values, pool=pool, chunk_size=3)
+
+    with then:
+        expected = substitute_many(UserSchema, values)
+        assert [str(x) if isinstance(x, SubstitutionError) else x for x in res] == \
+               [str(x) if isinstance(x, SubstitutionError) else x for x in expected]
+
+
+def test_substitute_in_process_pool():
+    with given:
+        sch = schema.list(UserSchema)
+        value = [{"id": i, "name": str(i)} for i in range(10)] + [{"id": "x"}]
+
+    with when, raises(SubstitutionError) as exception:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            substitute(sch, value, pool=pool, chunk_size=4)
+
+    with then:
+        assert exception.value.path == (10, "id")
+
+
+def test_pickle_substituted_schema():
+    with given:
+        res = substitute(schema.dict({"ids": schema.list(schema.int), "any": schema.any}),
+                         {"ids": [1, 2], "any": None})
+
+    with when:
+        unpickled = pickle.loads(pickle.dumps(res))
+
+    with then:
+        assert unpickled == res
+
+
+def test_pickle_substitution_error():
+    with given:
+        with raises(SubstitutionError) as exception:
+            substitute(schema.list(UserSchema), [{"id": "1", "name": "1"}])
+
+    with when:
+        unpickled = pickle.loads(pickle.dumps(exception.value))
+
+    with then:
+        assert str(unpickled) == str(exception.value)
+        assert unpickled.path == (0, "id")
@@ -0,0 +1,73 @@
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import Profiler, profile
+from revolt.errors import SubstitutionError
+
+
+def parse_collapsed(output):
+    stacks = {}
+    for line in output.splitlines():
+        stack, count = line.rsplit(" ", 1)
+        stacks[stack] = int(count)
+    return stacks
+
+
+def test_profile():
+    with given:
+        sch = schema.dict({"users": schema.list(schema.dict({"zip": schema.str}))})
+        value = {"users": [{"zip": str(i)} for i in range(100)]}
+
+    with when:
+        profiler = profile(sch, value)
+
+    with then:
+        assert profiler.stats[(("root", "users", "[*]", "zip"), "visit_str")].calls == 100
+        assert profiler.stats[(("root", "users", "[*]", "zip"), "validate")].calls == 100
+
+
+def test_profile_collapsed():
+    with given:
+        sch = schema.dict({"users": schema.list(schema.dict({"zip": schema.str}))})
+        value = {"users": [{"zip": str(i)} for i in range(100)]}
+
+    with when:
+        stacks = parse_collapsed(profile(sch, value).collapsed())
+
+    with then:
+        assert set(stacks) <= {
+            "root",
+            "root;(validate)",
+            "root;users",
+            "root;users;(validate)",
+            "root;users;[*]",
+            "root;users;[*];(validate)",
+            "root;users;[*];zip",
+            "root;users;[*];zip;(validate)",
+        }
+        assert "root;users;[*];zip;(validate)" in stacks
+        assert all(count > 0 for count in stacks.values())
+
+
+def test_profile_collapsed_escapes_separator():
+    with given:
+        profiler = profile(schema.dict({"a;b": schema.list([schema.int] * 50)}),
+                           {"a;b": list(range(50))})
+
+    with when:
+        stacks = parse_collapsed(profiler.collapsed())
+
+    with then:
+        assert all(x.split(";")[1:2] in ([], ["a,b"], ["(validate)"]) for x in stacks)
+
+
+def test_profile_error():
+    with given:
+        profiler = Profiler()
+
+    with when, raises(SubstitutionError):
+        profile(schema.list(schema.int), [1, "2"], profiler=profiler)
+
+    with then:
+        assert profiler.by_method()["visit_list"].errors == 1
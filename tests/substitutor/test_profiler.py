@@ -0,0 +1,155 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import Profiler, Substitutor
+from revolt.errors import SubstitutionError
+
+
+def test_profile_by_method():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int, "tags": schema.list})
+
+    with when:
+        with substitutor.profile() as profiler:
+            res = substitutor.compile(sch)({"id": 1, "tags": ["a", "b"]})
+
+    with then:
+        assert res == schema.dict({"id": schema.int(1), "tags": schema.list([schema.str("a"),
+                                                                             schema.str("b")])})
+        methods = profiler.by_method()
+        assert {name: stats.calls for name, stats in methods.items()} == {
+            "visit_dict": 1,
+            "visit_int": 1,
+            "visit_list": 1,
+            "from_native": 2,
+        }
+        assert all(stats.time >= stats.self_time >= 0 for stats in methods.values())
+
+
+def test_profile_by_method_includes_validation():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int})
+
+    with when:
+        with substitutor.profile() as profiler:
+            substitutor.compile(sch)({"id": 1})
+
+    with then:
+        validation = profiler.stats[(("root", "id"), "validate")]
+        assert validation.calls == 1
+        assert profiler.by_method()["visit_int"].self_time >= validation.self_time
+
+
+def test_profile_by_path():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({
+            "users": schema.list(schema.dict({
+                "address": schema.dict({"zip": schema.str}),
+            })),
+            "ids": schema.list([schema.int, ..., ]),
+            "name": schema.any(schema.str, schema.none),
+        })
+        value = {
+            "users": [{"address": {"zip": "1"}}, {"address": {"zip": "2"}}],
+            "ids": [1, 2],
+            "name": None,
+        }
+
+    with when:
+        with substitutor.profile() as profiler:
+            substitutor.compile(sch)(value)
+
+    with then:
+        assert {path: stats.calls for path, stats in profiler.by_path().items()} == {
+            ("root",): 2,  # visit_dict + validate
+            ("root", "users"): 2,
+            ("root", "users", "[*]"): 4,
+            ("root", "users", "[*]", "address"): 4,
+            ("root", "users", "[*]", "address", "zip"): 4,
+            ("root", "ids"): 3,  # visit_list + validate + from_native
+            ("root", "ids", "[0]"): 2,
+            ("root", "name"): 2,
+            ("root", "name", "<1>"): 2,  # matched alternatives aren't validated twice
+        }
+
+
+@pytest.mark.parametrize(("sch", "value", "method"), [
+    (schema.any(schema.int(1), schema.int), 2, "visit_any"),
+    (schema.list([..., schema.str.len(2), ...]), ["a", "bb"], "visit_list"),
+])
+def test_profile_discarded(sch, value, method):
+    with given:
+        substitutor = Substitutor()
+
+    with when:
+        with substitutor.profile() as profiler:
+            substitutor.compile(sch)(value)
+
+    with then:
+        assert profiler.stats[(("root",), method)].discarded == 1
+
+
+def test_profile_error_counted_once():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"items": schema.list(schema.int)})
+
+    with when, raises(SubstitutionError):
+        with substitutor.profile() as profiler:
+            substitutor.compile(sch)({"items": [1, "2"]})
+
+    with then:
+        assert sum(stats.errors for stats in profiler.by_method().values()) == 1
+        assert profiler.by_method()["visit_dict"].errors == 1
+
+
+def test_profile_doesnt_change_cached_plans():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.list(schema.int)
+        plan = substitutor.compile(sch)
+
+    with when:
+        with substitutor.profile():
+            profiled_plan = substitutor.compile(sch)
+
+    with then:
+        assert profiled_plan is not plan
+        assert substitutor.compile(sch) is plan
+
+
+def test_profile_clear():
+    with given:
+        substitutor = Substitutor()
+        profiler = Profiler()
+        sch = schema.int
+
+        with substitutor.profile(profiler):
+            substitutor.compile(sch)(1)
+
+    with when:
+        profiler.clear()
+        with substitutor.profile(profiler):
+            substitutor.compile(sch)(2)
+
+    with then:
+        assert profiler.by_method()["visit_int"].calls == 1
+
+
+def test_profile_report():
+    with given:
+        substitutor = Substitutor()
+        with substitutor.profile() as profiler:
+            substitutor.compile(schema.dict({"users": schema.list(schema.str)}))({"users": ["a"]})
+
+    with when:
+        report = profiler.report()
+
+    with then:
+        assert "visit_dict" in report
+        assert "root.users[*]" in report
@@ -0,0 +1,117 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import optional, schema
+from pytest import raises
+
+from revolt import resubstitute, substitute
+from revolt.errors import SubstitutionError
+
+UserSchema = schema.dict({
+    "id": schema.int,
+    "name": schema.str,
+    optional("email"): schema.str,
+    "tags": schema.list(schema.str),
+    "address": schema.dict({"city": schema.str, "zip": schema.str}),
+    "meta": schema.dict({...: ...}),
+    "history": schema.list([schema.int, ...]),
+    "alias": schema.alias("Rank", schema.list(schema.int)),
+})
+
+USER = {
+    "id": 1,
+    "name": "Bob",
+    "tags": ["a", "b"],
+    "address": {"city": "Paris", "zip": "75001"},
+    "meta": {"source": "api", "raw": [1, "x"]},
+    "history": [1, 2, 3],
+    "alias": [7],
+}
+
+
+@pytest.mark.parametrize(("patch", "expected"), [
+    ([("/id", 2)], {**USER, "id": 2}),
+    ([("/email", "bob@localhost")], {**USER, "email": "bob@localhost"}),
+    ([("/tags/1", "c")], {**USER, "tags": ["a", "c"]}),
+    ([("/address/city", "Rome")], {**USER, "address": {"city": "Rome", "zip": "75001"}}),
+    ([("/meta/source", "db")], {**USER, "meta": {"source": "db", "raw": [1, "x"]}}),
+    ([("/meta/raw/1", None)], {**USER, "meta": {"source": "api", "raw": [1, None]}}),
+    ([("/meta/new", 1)], {**USER, "meta": {**USER["meta"], "new": 1}}),
+    ([("/history/0", 5), ("/history/2", 6)], {**USER, "history": [5, 2, 6]}),
+    ([("/alias/0", 8)], {**USER, "alias": [8]}),
+    ([(("id",), 3), ("", {**USER, "id": 4})], {**USER, "id": 4}),
+])
+def test_resubstitute(patch, expected):
+    with given:
+        previous = substitute(UserSchema, USER)
+
+    with when:
+        res = resubstitute(previous, UserSchema, patch)
+
+    with then:
+        assert res == substitute(UserSchema, expected)
+
+
+def test_resubstitute_shares_unchanged_subschemas():
+    with given:
+        previous = substitute(UserSchema, USER)
+
+    with when:
+        res = resubstitute(previous, UserSchema, [("/address/city", "Rome")])
+
+    with then:
+        assert res.props.keys["tags"] is previous.props.keys["tags"]
+        assert previous == substitute(UserSchema, USER)
+
+
+def test_resubstitute_unsubstituted_key():
+    with given:
+        sch = schema.dict({"id": schema.int, "address": schema.dict({"city": schema.str})})
+        previous = substitute(sch, {"id": 1})
+
+    with when:
+        res = resubstitute(previous, sch, [("/address/city", "Rome")])
+
+    with then:
+        assert res == substitute(sch, {"id": 1, "address": {"city": "Rome"}})
+
+
+def test_resubstitute_escaped_path():
+    with given:
+        sch = schema.dict({"a/b": schema.int, "c~d": schema.int})
+        previous = substitute(sch, {"a/b": 1, "c~d": 2})
+
+    with when:
+        res = resubstitute(previous, sch, [("/a~1b", 3), ("/c~0d", 4)])
+
+    with then:
+        assert res == substitute(sch, {"a/b": 3, "c~d": 4})
+
+
+@pytest.mark.parametrize(("patch", "message"), [
+    ([("/address/zip", 75001)],
+     "Value 75001 at _['address']['zip'] must be <class 'str'>, but <class 'int'> given"),
+    ([("/unknown", 1)], "Unknown key 'unknown'"),
+    ([("/tags/2", "c")], "Index 2 out of range"),
+    ([("/tags/x", "c")], "Can't patch key 'x' of a list"),
+    ([("/id/x", 1)], "Can't patch 'x' of schema.int(1)"),
+])
+def test_resubstitute_error(patch, message):
+    with given:
+        previous = substitute(UserSchema, USER)
+
+    with when, raises(SubstitutionError) as exception:
+        resubstitute(previous, UserSchema, patch)
+
+    with then:
+        assert message in str(exception.value)
+
+
+def test_resubstitute_invalid_path():
+    with given:
+        previous = substitute(UserSchema, USER)
+
+    with when, raises(ValueError) as exception:
+        resubstitute(previous, UserSchema, [("id", 1)])
+
+    with then:
+        assert str(exception.value) == "Path must be empty or start with '/', 'id' given"
@@ -0,0 +1,152 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from pytest import raises
+
+from revolt import ResultCache, disable_result_cache, enable_result_cache, substitute
+from revolt.errors import SubstitutionError
+
+
+@pytest.fixture()
+def cache(request):
+    yield enable_result_cache(max_size=2, policy=getattr(request, "param", "lru"))
+    disable_result_cache()
+
+
+def make_schema():
+    return schema.dict({"id": schema.int, "name": schema.str})
+
+
+def test_result_cache_hit(cache):
+    with given:
+        first = substitute(make_schema(), {"id": 1, "name": "Bob"})
+
+    with when:
+        second = make_schema() % {"id": 1, "name": "Bob"}
+
+    with then:
+        assert second is first
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size, stats.max_size) == (1, 1, 1, 2)
+
+
+@pytest.mark.parametrize(("first", "second"), [
+    ({"id": 1}, {"id": 2}),
+    ([1], [True]),
+    ([1], [1.0]),
+    ([0.0], [-0.0]),
+])
+def test_result_cache_miss(first, second, cache):
+    with given:
+        sch = schema.any
+        first_res = substitute(sch, first)
+
+    with when:
+        res = substitute(sch, second)
+
+    with then:
+        assert repr(res) != repr(first_res)
+        assert (cache.stats().hits, cache.stats().misses) == (0, 2)
+
+
+def test_result_cache_options(cache):
+    with given:
+        sch = make_schema()
+        substitute(sch, {"id": 1})
+
+    with when:
+        substitute(sch, {"id": 1}, fail_fast=True)
+
+    with then:
+        assert (cache.stats().hits, cache.stats().misses) == (0, 2)
+
+
+def test_result_cache_skips_lazy_results(cache):
+    with given:
+        sch = schema.dict({...: ...})
+        value = {"a": 1}
+        first = substitute(sch, value, lazy=True)
+        value["a"] = 999
+
+    with when:
+        res = substitute(sch, {"a": 1}, lazy=True)
+
+    with then:
+        assert res is not first
+        assert res == schema.dict({"a": schema.int(1), ...: ...})
+        assert (cache.stats().hits, cache.stats().misses, cache.stats().size) == (0, 0, 0)
+
+
+def test_result_cache_skips_errors(cache):
+    with given:
+        sch = make_schema()
+
+    with when:
+        for _ in range(2):
+            with raises(SubstitutionError):
+                substitute(sch, {"id": "1"})
+
+    with then:
+        assert (cache.stats().hits, cache.stats().misses, cache.stats().size) == (0, 2, 0)
+
+
+def test_result_cache_skips_non_plain_values(cache):
+    with given:
+        class Id(int):
+            pass
+
+    with when:
+        res = substitute(schema.int, Id(1))
+
+    with then:
+        assert res == schema.int(1)
+        assert (cache.stats().misses, cache.stats().size) == (0, 0)
+
+
+@pytest.mark.parametrize(("cache", "kept"), [
+    ("lru", 1),
+    ("fifo", 2),
+], indirect=["cache"])
+def test_result_cache_eviction(cache, kept):
+    with given:
+        results = {value: substitute(schema.int, value) for value in (1, 2)}
+        substitute(schema.int, 1)
+        substitute(schema.int, 3)
+
+    with when:
+        res = substitute(schema.int, kept)
+
+    with then:
+        assert res is results[kept]
+        assert cache.stats().size == 2
+
+
+def test_result_cache_clear(cache):
+    with given:
+        substitute(schema.int, 1)
+        substitute(schema.int, 1)
+
+    with when:
+        cache.clear()
+
+    with then:
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (0, 0, 0)
+
+
+def test_result_cache_unknown_policy():
+    with when, raises(ValueError) as exception:
+        ResultCache(policy="random")
+
+    with then:
+        assert str(exception.value) == ("Eviction policy must be one of ('lru', 'fifo'), "
+                                        "'random' given")
+
+
+def test_result_cache_disabled():
+    with when:
+        first = substitute(schema.int, 1)
+        second = substitute(schema.int, 1)
+
+    with then:
+        assert first is not second
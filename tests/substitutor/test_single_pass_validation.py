@@ -0,0 +1,160 @@
+from typing import Any
+
+import pytest
+from baby_steps import given, then, when
+from district42 import GenericSchema, schema
+from pytest import raises
+from valera import ValidationResult
+
+from revolt import Substitutor, SubstitutorValidator, substitute
+from revolt.errors import SubstitutionError
+
+
+class CountingValidator(SubstitutorValidator):
+    def __init__(self) -> None:
+        super().__init__()
+        self.visited = 0
+
+    def visit_int(self, schema: GenericSchema, **kwargs: Any) -> ValidationResult:
+        self.visited += 1
+        return super().visit_int(schema, **kwargs)
+
+
+def make_nested_schema(depth: int, leaf: GenericSchema) -> GenericSchema:
+    sch = leaf
+    for _ in range(depth):
+        sch = schema.dict({"nested": sch})
+    return sch
+
+
+def make_nested_value(depth: int) -> Any:
+    value: Any = 42
+    for _ in range(depth):
+        value = {"nested": value}
+    return value
+
+
+def test_nested_dict_leaf_validated_once():
+    with given:
+        validator = CountingValidator()
+        substitutor = Substitutor(validator)
+        sch = make_nested_schema(10, schema.int)
+
+    with when:
+        res = sch.__accept__(substitutor, value=make_nested_value(10))
+
+    with then:
+        assert res == make_nested_schema(10, schema.int(42))
+        assert validator.visited == 1
+
+
+def test_typed_list_elements_validated_once():
+    with given:
+        validator = CountingValidator()
+        substitutor = Substitutor(validator)
+        sch = schema.list(schema.list(schema.int))
+
+    with when:
+        res = sch.__accept__(substitutor, value=[[1, 2], [3]])
+
+    with then:
+        assert res == schema.list([
+            schema.list([schema.int(1), schema.int(2)]),
+            schema.list([schema.int(3)]),
+        ])
+        assert validator.visited == 3
+
+
+@pytest.mark.parametrize("flag", ["validated", "_validated"])
+def test_validated_flag_isnt_public(flag: str):
+    with when, raises(Exception) as exception:
+        substitute(schema.int, "x", **{flag: True})
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+@pytest.mark.parametrize("flag", ["validated", "_validated"])
+def test_validated_flag_isnt_accepted_by_visitors(flag: str):
+    with when, raises(Exception) as exception:
+        schema.int.__accept__(Substitutor(), value="x", **{flag: True})
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+def test_overridden_visitor_value_validated():
+    with given:
+        class StrSubstitutor(Substitutor):
+            def visit_int(self, schema: GenericSchema, **kwargs: Any) -> Any:
+                return super().visit_int(schema, **{**kwargs, "value": str(kwargs["value"])})
+
+        sch = schema.dict({"id": schema.int})
+
+    with when, raises(Exception) as exception:
+        sch.__accept__(StrSubstitutor(), value={"id": 1})
+
+    with then:
+        assert exception.type is SubstitutionError
+
+
+def test_nested_validation_error_message():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int, "items": schema.list(schema.int)})
+
+    with when, raises(Exception) as exception:
+        sch.__accept__(substitutor, value={"id": 1, "items": [1, "2"]})
+
+    with then:
+        assert exception.type is SubstitutionError
+        assert str(exception.value) == (
+            "\n - Value '2' at _['items'][1] must be <class 'int'>, "
+            "but <class 'str'> given"
+        )
+
+
+def test_any_mismatch_error_message():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.dict({"id": schema.int | schema.str})
+
+    with when, raises(Exception) as exception:
+        sch.__accept__(substitutor, value={"id": None})
+
+    with then:
+        assert exception.type is SubstitutionError
+        assert str(exception.value).startswith("\n - Value <class 'NoneType'> at _['id']")
+
+
+def test_nested_union_leaf_validated_once():
+    with given:
+        validator = CountingValidator()
+        substitutor = Substitutor(validator)
+        sch: GenericSchema = schema.int
+        for _ in range(12):
+            sch = schema.dict({"nested": sch}) | schema.none
+
+    with when:
+        res = sch.__accept__(substitutor, value=make_nested_value(12))
+
+    with then:
+        # equality of nested unions takes exponential time in district42
+        assert repr(res) == repr(Substitutor().compile(sch)(make_nested_value(12)))
+        assert validator.visited == 1
+
+
+def test_union_under_dict_validated_once():
+    with given:
+        validator = CountingValidator()
+        substitutor = Substitutor(validator)
+        sch = schema.dict({"ids": schema.list(schema.int) | schema.none})
+
+    with when:
+        res = sch.__accept__(substitutor, value={"ids": [1, 2]})
+
+    with then:
+        assert res == schema.dict({
+            "ids": schema.any(schema.list([schema.int(1), schema.int(2)])),
+        })
+        assert validator.visited == 2
@@ -0,0 +1,64 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import optional, schema
+
+from revolt import substitute
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.none, None),
+    (schema.int(1), 1),
+    (schema.str("banana"), "banana"),
+    (schema.list([schema.int(1), schema.bool(True)]), [1, True]),
+    (schema.dict({"id": schema.int(1), optional("name"): schema.str}), {"id": 1}),
+])
+def test_substitution_shares_unchanged_schema(sch, value):
+    with when:
+        res = substitute(sch, value, share=True)
+
+    with then:
+        assert res is sch
+
+
+@pytest.mark.parametrize(("sch", "value"), [
+    (schema.int(1), True),
+    (schema.int, 1),
+    (schema.dict({optional("id"): schema.int(1)}), {"id": 1}),
+])
+def test_substitution_doesnt_share_changed_schema(sch, value):
+    with when:
+        res = substitute(sch, value, share=True)
+
+    with then:
+        assert res is not sch
+        assert res == substitute(sch, value)
+
+
+def test_substitution_shares_untouched_subtrees():
+    with given:
+        sch = schema.dict({
+            "id": schema.int,
+            "profile": schema.dict({"name": schema.str, "age": schema.int(42)}),
+            "friends": schema.list(schema.dict({"id": schema.int})),
+        })
+
+    with when:
+        res = substitute(sch, {"id": 1, "profile": {"name": "Bob", "age": 42}}, share=True)
+
+    with then:
+        assert res == substitute(sch, {"id": 1, "profile": {"name": "Bob", "age": 42}})
+        assert res.props.keys["friends"] is sch.props.keys["friends"]
+        profile, _ = res.props.keys["profile"]
+        assert profile.props.keys["age"][0] is sch.props.keys["profile"][0].props.keys["age"][0]
+
+
+def test_substitution_without_share():
+    with given:
+        sch = schema.dict({"id": schema.int(1)})
+
+    with when:
+        res = substitute(sch, {"id": 1})
+
+    with then:
+        assert res == sch
+        assert res is not sch
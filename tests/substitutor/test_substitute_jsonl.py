@@ -0,0 +1,77 @@
+from io import StringIO
+
+from baby_steps import given, then, when
+from district42 import schema
+
+from revolt import substitute_jsonl
+from revolt.errors import SubstitutionError
+
+
+def test_substitute_jsonl():
+    with given:
+        sch = schema.dict({"id": schema.int})
+        stream = StringIO('{"id": 1}\n{"id": 2}\n')
+
+    with when:
+        res = list(substitute_jsonl(sch, stream))
+
+    with then:
+        assert res == [schema.dict({"id": schema.int(1)}), schema.dict({"id": schema.int(2)})]
+
+
+def test_substitute_jsonl_is_lazy():
+    with given:
+        sch = schema.int
+        consumed = []
+
+        def lines():
+            for line in ["1", "2"]:
+                consumed.append(line)
+                yield line
+
+    with when:
+        res = next(substitute_jsonl(sch, lines()))
+
+    with then:
+        assert res == schema.int(1)
+        assert consumed == ["1"]
+
+
+def test_substitute_jsonl_errors():
+    with given:
+        sch = schema.dict({"id": schema.int})
+        lines = [b'{"id": 1}', b'{"id": "2"}', b'{"id":']
+
+    with when:
+        res = list(substitute_jsonl(sch, lines))
+
+    with then:
+        assert res[0] == schema.dict({"id": schema.int(1)})
+        assert isinstance(res[1], SubstitutionError)
+        assert isinstance(res[2], SubstitutionError)
+        assert str(res[2]).startswith("Can't parse line 3")
+
+
+def test_substitute_jsonl_skips_blank_lines():
+    with given:
+        sch = schema.int
+        stream = StringIO('1\n\n  \n2\n\n')
+
+    with when:
+        res = list(substitute_jsonl(sch, stream))
+
+    with then:
+        assert res == [schema.int(1), schema.int(2)]
+
+
+def test_substitute_jsonl_error_line_counts_blank_lines():
+    with given:
+        sch = schema.int
+        lines = [b"1", b"", b"{"]
+
+    with when:
+        res = list(substitute_jsonl(sch, lines))
+
+    with then:
+        assert res[0] == schema.int(1)
+        assert str(res[1]).startswith("Can't parse line 3")
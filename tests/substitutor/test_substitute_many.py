@@ -0,0 +1,53 @@
+from baby_steps import given, then, when
+from district42 import schema
+
+from revolt import substitute, substitute_many
+from revolt.errors import SubstitutionError
+
+
+def test_substitute_many():
+    with given:
+        sch = schema.dict({"id": schema.int, "name": schema.str})
+        values = [{"id": 1, "name": "Bob"}, {"id": 2, "name": "Alice"}]
+
+    with when:
+        res = substitute_many(sch, values)
+
+    with then:
+        assert res == [substitute(sch, x) for x in values]
+
+
+def test_substitute_many_empty():
+    with given:
+        sch = schema.int
+
+    with when:
+        res = substitute_many(sch, [])
+
+    with then:
+        assert res == []
+
+
+def test_substitute_many_generator():
+    with given:
+        sch = schema.int
+
+    with when:
+        res = substitute_many(sch, (x for x in range(3)))
+
+    with then:
+        assert res == [schema.int(0), schema.int(1), schema.int(2)]
+
+
+def test_substitute_many_errors():
+    with given:
+        sch = schema.dict({"id": schema.int})
+        values = [{"id": 1}, {"id": "2"}, {"id": 3}]
+
+    with when:
+        res = substitute_many(sch, values)
+
+    with then:
+        assert res[0] == schema.dict({"id": schema.int(1)})
+        assert isinstance(res[1], SubstitutionError)
+        assert res[2] == schema.dict({"id": schema.int(3)})
@@ -0,0 +1,66 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+
+from revolt import Profiler, Substitutor, substitute
+from revolt.errors import SubstitutionError
+
+
+@pytest.fixture()
+def switch_often():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def make_schema(index):
+    return schema.dict({
+        "id": schema.int,
+        "items": schema.list(schema.int | schema.str(str(index))),
+        "meta": schema.dict({...: ...}),
+    })
+
+
+def make_value(index):
+    return {"id": index, "items": [index, str(index), ..., ], "meta": {"n": [index]}}
+
+
+def substitute_or_error(sch, value):
+    try:
+        return substitute(sch, value)
+    except SubstitutionError as e:
+        return str(e)
+
+
+def test_substitute_in_threads(switch_often):
+    with given:
+        shared = make_schema(0)
+        cases = [(shared if i % 2 else make_schema(i % 7), make_value(i % 7)) for i in range(400)]
+        expected = [substitute_or_error(sch, value) for sch, value in cases]
+
+    with when:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda case: substitute_or_error(*case), cases))
+
+    with then:
+        assert results == expected
+
+
+def test_profile_in_thread_doesnt_affect_other_threads():
+    with given:
+        substitutor = Substitutor()
+        sch = schema.list(schema.int)
+
+    with when:
+        with substitutor.profile() as profiler:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                res = executor.submit(lambda: substitutor.compile(sch)([1, 2])).result()
+
+    with then:
+        assert res == schema.list([schema.int(1), schema.int(2)])
+        assert profiler.stats == {}
+        assert isinstance(profiler, Profiler)
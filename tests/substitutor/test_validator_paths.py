@@ -0,0 +1,51 @@
+from unittest.mock import patch
+
+from baby_steps import given, then, when
+from district42 import schema
+from th import PathHolder
+from valera.errors import TypeValidationError
+
+from revolt import SubstitutorValidator
+
+
+def test_validator_happy_path_builds_no_paths():
+    with given:
+        validator = SubstitutorValidator()
+        sch = schema.list(schema.dict({"id": schema.int, "tags": schema.list([schema.str, ...])}))
+        value = [{"id": x, "tags": ["a", "b"]} for x in range(100)]
+
+    with when, patch("revolt._validator.deepcopy") as deepcopy_:
+        res = sch.__accept__(validator, value=value)
+
+    with then:
+        assert res.get_errors() == []
+        assert deepcopy_.call_count == 0
+
+
+def test_validator_nested_error_path():
+    with given:
+        validator = SubstitutorValidator()
+        sch = schema.list(schema.dict({"items": schema.list([schema.int, ...])}))
+        value = [{"items": [1]}, {"items": ["2", 3]}]
+
+    with when:
+        res = sch.__accept__(validator, value=value)
+
+    with then:
+        assert res.get_errors() == [
+            TypeValidationError(PathHolder()[1]["items"][0], "2", int),
+        ]
+
+
+def test_validator_error_path_relative_to_given_path():
+    with given:
+        validator = SubstitutorValidator()
+        sch = schema.dict({"id": schema.int})
+
+    with when:
+        res = sch.__accept__(validator, value={"id": None}, path=PathHolder()["root"])
+
+    with then:
+        assert res.get_errors() == [
+            TypeValidationError(PathHolder()["root"]["id"], None, int),
+        ]
@@ -0,0 +1,48 @@
+import pytest
+from baby_steps import given, then, when
+from district42 import schema
+from niltype import Nil
+
+from revolt import Substitutor
+
+
+class UpperSubstitutor(Substitutor):
+    def visit_str(self, schema, *, value=Nil, **kwargs):
+        return super().visit_str(schema, value=value.upper(), **kwargs)
+
+
+class ExtendedSubstitutor(Substitutor):
+    pass
+
+
+class _StrExtension(ExtendedSubstitutor, extend=True):
+    def visit_str(self, schema, *, value=Nil, **kwargs):
+        return Substitutor.visit_str(self, schema, value=value.upper(), **kwargs)
+
+
+@pytest.mark.parametrize("substitutor_type", [UpperSubstitutor, ExtendedSubstitutor])
+@pytest.mark.parametrize(("sch", "value", "expected"), [
+    (schema.str, "x", schema.str("X")),
+    (schema.dict({"a": schema.str}), {"a": "x"}, schema.dict({"a": schema.str("X")})),
+    (schema.list(schema.str), ["x", "y"], schema.list([schema.str("X"), schema.str("Y")])),
+    (schema.list([schema.str, ...]), ["x", 1], schema.list([schema.str("X"), schema.int(1)])),
+    (schema.str | schema.int, "x", schema.any(schema.str("X"))),
+])
+def test_overridden_visit_is_called_for_nested_schemas(substitutor_type, sch, value, expected):
+    with given:
+        substitutor = substitutor_type()
+
+    with when:
+        res = sch.__accept__(substitutor, value=value)
+
+    with then:
+        assert res == expected
+        assert substitutor.compile(sch)(value) == expected
+
+
+def test_base_substitutor_isnt_affected():
+    with when:
+        res = schema.dict({"a": schema.str}).__accept__(Substitutor(), value={"a": "x"})
+
+    with then:
+        assert res == schema.dict({"a": schema.str("x")})